@@ -0,0 +1,344 @@
+import heapq
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; images fall back to raw bytes.
+    Image = None
+
+try:
+    import toml
+except ImportError:  # toml is optional; .toml level data falls back to raw text.
+    toml = None
+
+
+ASSET_KINDS = {
+    "images": "image",
+    "sounds": "sound",
+    "fonts": "font",
+    "levels": "level_data",
+}
+
+LEVEL_PATTERN = re.compile(r"level[_-]?(\d+)", re.IGNORECASE)
+
+PRIORITY_NEXT_LEVEL = 0
+PRIORITY_SHARED = 1
+PRIORITY_BACKGROUND = 2
+
+
+class AssetEntry:
+    """A single file in the asset manifest."""
+
+    __slots__ = ("name", "path", "kind", "level", "file_size")
+
+    def __init__(self, name, path, kind, level, file_size):
+        self.name = name
+        self.path = path
+        self.kind = kind
+        self.level = level
+        self.file_size = file_size
+
+    def __repr__(self):
+        return f"AssetEntry({self.name!r}, kind={self.kind!r}, level={self.level!r})"
+
+
+class AssetCache:
+    """
+    Thread-safe LRU cache of decoded assets bounded by a total byte budget.
+
+    Assets requested with get() evict least recently used entries as needed.
+    Background preloads are more modest: an asset for the pinned next level
+    may evict only unpinned entries, and any other preload is cached only if
+    it fits in the remaining budget, so lower-priority preloads never push
+    out the next level's assets.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Args:
+            max_bytes (int): Maximum combined size of cached assets, in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # name -> (asset, size)
+        self._pinned = frozenset()  # Names of the next level's assets
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Returns a cached asset and marks it most recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, name, asset, size, background=False):
+        """
+        Stores an asset, evicting least recently used assets to stay within budget.
+
+        Assets larger than the whole budget are not cached.
+
+        Args:
+            background (bool): True for preloads, which evict nothing unless the asset is
+                               pinned, and then only unpinned entries.
+
+        Returns:
+            bool: True if the asset was cached.
+        """
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            old_size = self._entries[name][1] if name in self._entries else 0
+            overflow = self.current_bytes - old_size + size - self.max_bytes
+            victims = None
+            if background and overflow > 0:
+                if name not in self._pinned:
+                    return False
+                victims = []
+                for other, (_, other_size) in self._entries.items():  # Oldest first
+                    if overflow <= 0:
+                        break
+                    if other != name and other not in self._pinned:
+                        victims.append(other)
+                        overflow -= other_size
+                if overflow > 0:
+                    return False
+            if name in self._entries:
+                self.current_bytes -= self._entries.pop(name)[1]
+            for other in victims or ():
+                self.current_bytes -= self._entries.pop(other)[1]
+                self.evictions += 1
+            self._entries[name] = (asset, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def pin(self, names):
+        """Marks the given assets (the next level's) as protected from background evictions."""
+        with self._lock:
+            self._pinned = frozenset(names)
+
+    def is_full(self):
+        """Returns True if no budget is left for unpinned background preloads."""
+        with self._lock:
+            return self.current_bytes >= self.max_bytes
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def decode_image(path):
+    """Decodes an image with Pillow, or returns its raw bytes if Pillow is unavailable."""
+    if Image is None:
+        return decode_raw(path)
+    with Image.open(path) as image:
+        image.load()
+        decoded = image.copy()
+    width, height = decoded.size
+    return decoded, width * height * len(decoded.getbands())
+
+
+def decode_level_data(path):
+    """Parses JSON or TOML level data, or returns the raw text for other formats."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        data = json.loads(text)
+    elif path.endswith(".toml") and toml is not None:
+        data = toml.loads(text)
+    else:
+        data = text
+    return data, sys.getsizeof(text)
+
+
+def decode_raw(path):
+    """Reads a file's bytes (sounds and fonts are handed to the audio/text layers as buffers)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, len(data)
+
+
+DECODERS = {
+    "image": decode_image,
+    "sound": decode_raw,
+    "font": decode_raw,
+    "level_data": decode_level_data,
+}
+
+
+class AssetManager:
+    """
+    Lazy asset loader for the Bloom Burst assets directory.
+
+    The directory is indexed once into a manifest.  Assets are decoded on
+    demand or preloaded in the background by a pool of worker threads, with the
+    assets for the upcoming level decoded first.  Decoded assets are kept in a
+    byte-bounded LRU cache.
+    """
+
+    def __init__(self, root="assets", max_cache_bytes=64 * 1024 * 1024, workers=4, decoders=None):
+        """
+        Args:
+            root (str): The assets directory.
+            max_cache_bytes (int): Byte budget of the decoded-asset cache.
+            workers (int): Number of background decoding threads.
+            decoders (dict): Optional overrides mapping asset kind to a decode function.
+                             A decoder takes a path and returns (asset, size_in_bytes).
+        """
+        self.root = root
+        self.cache = AssetCache(max_cache_bytes)
+        self.decoders = dict(DECODERS)
+        if decoders:
+            self.decoders.update(decoders)
+        self.manifest = self._build_manifest()
+
+        self._pending = []  # heap of (priority, seq, name)
+        self._in_flight = {}  # name -> Future
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"asset-loader-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _build_manifest(self):
+        """Walks the assets directory once and records every file by its relative name."""
+        manifest = {}
+        if not os.path.isdir(self.root):
+            return manifest
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                top = name.split("/", 1)[0]
+                if top not in ASSET_KINDS or "/" not in name:
+                    continue  # Skip README files and anything outside the known directories.
+                match = LEVEL_PATTERN.search(name)
+                level = int(match.group(1)) if match else None
+                manifest[name] = AssetEntry(name, path, ASSET_KINDS[top], level, os.path.getsize(path))
+        return manifest
+
+    def assets_for_level(self, level):
+        """Returns the manifest entries tagged for a level (e.g. images/level_4/creeper.png)."""
+        return [entry for entry in self.manifest.values() if entry.level == level]
+
+    def get(self, name):
+        """
+        Returns a decoded asset, decoding it on the calling thread if it is not cached
+        and not already being decoded in the background.
+
+        Args:
+            name (str): The asset's name relative to the assets directory (e.g. "images/rose.png").
+
+        Raises:
+            KeyError: If the asset is not in the manifest.
+        """
+        asset = self.cache.get(name)
+        if asset is not None:
+            return asset
+        entry = self.manifest[name]
+        with self._condition:
+            future = self._in_flight.get(name)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[name] = future
+        if owner:
+            self._decode(entry, future)
+        return future.result()
+
+    def preload(self, names, priority=PRIORITY_BACKGROUND):
+        """
+        Queues assets for background decoding.
+
+        Args:
+            names (iterable): Asset names to decode.
+            priority (int): Lower values are decoded first.
+        """
+        with self._condition:
+            for name in names:
+                if name not in self.manifest or name in self._in_flight or name in self.cache:
+                    continue
+                heapq.heappush(self._pending, (priority, next(self._counter), name))
+            self._condition.notify_all()
+
+    def preload_level(self, level):
+        """
+        Queues the next level's assets ahead of shared assets and everything else.
+
+        The level's assets are pinned, so shared assets preloaded after them only
+        fill whatever budget is left instead of evicting them.
+        """
+        level_assets = [entry.name for entry in self.manifest.values() if entry.level == level]
+        shared_assets = [entry.name for entry in self.manifest.values() if entry.level is None]
+        self.cache.pin(level_assets)
+        self.preload(level_assets, PRIORITY_NEXT_LEVEL)
+        self.preload(shared_assets, PRIORITY_SHARED)
+
+    def pending_count(self):
+        """Returns the number of assets still waiting to be decoded."""
+        with self._condition:
+            return len(self._pending)
+
+    def shutdown(self):
+        """Stops the background workers.  Queued but undecoded assets are dropped."""
+        with self._condition:
+            self._shutdown = True
+            self._pending.clear()
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def _worker_loop(self):
+        """Decodes queued assets in priority order until shutdown."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._shutdown:
+                    self._condition.wait()
+                if self._shutdown:
+                    return
+                priority, _, name = heapq.heappop(self._pending)
+                if name in self._in_flight or name in self.cache:
+                    continue
+                if priority > PRIORITY_NEXT_LEVEL and self.cache.is_full():
+                    continue  # It could not be cached anyway; get() will decode it on demand.
+                future = Future()
+                self._in_flight[name] = future
+            self._decode(self.manifest[name], future, background=True)
+
+    def _decode(self, entry, future, background=False):
+        """Decodes an asset, caches it and resolves its future."""
+        try:
+            asset, size = self.decoders[entry.kind](entry.path)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            self.cache.put(entry.name, asset, size, background)
+            future.set_result(asset)
+        finally:
+            with self._condition:
+                self._in_flight.pop(entry.name, None)
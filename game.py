@@ -1,4 +1,62 @@
+import argparse
+import contextlib
 import random
+import sys
+import time
+
+from game_state import GameState
+from leaderboard import Leaderboard
+from zobrist import DEFAULT_TABLE, EvaluationCache
+
+ORDER_REWARD = 100  # Points awarded for each fulfilled order
+
+# Script mode commands: letter -> (name, number of integer arguments)
+SCRIPT_COMMANDS = {
+    'p': ('place', 3),   # p <flower> <row> <col>
+    'r': ('remove', 2),  # r <row> <col>
+    'c': ('check', 0),   # c
+    'x': ('exit', 0),    # x
+}
+
+
+def parse_commands(lines, on_error=None):
+    """
+    Parses script mode commands such as "p 1 0 0; r 2 3; c" from an iterable of lines.
+
+    Commands are separated by ';' or newlines, and '#' starts a comment.
+    Yields (line_number, command, args) tuples.  Malformed commands raise
+    ValueError, or, if on_error is given, are reported as on_error(line_number, message)
+    and skipped.
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0]
+        for text in line.split(';'):
+            parts = text.split()
+            if not parts:
+                continue
+            try:
+                name, args = _parse_command(parts)
+            except ValueError as e:
+                if on_error is None:
+                    raise ValueError(f"line {line_number}: {e}") from None
+                on_error(line_number, str(e))
+                continue
+            yield line_number, name, args
+
+
+def _parse_command(parts):
+    """Validates one split command and returns (command, args)."""
+    command = SCRIPT_COMMANDS.get(parts[0].lower())
+    if command is None:
+        raise ValueError(f"unknown command '{parts[0]}'")
+    name, arity = command
+    if len(parts) - 1 != arity:
+        raise ValueError(f"'{parts[0]}' takes {arity} arguments, got {len(parts) - 1}")
+    try:
+        args = tuple(int(arg) for arg in parts[1:])
+    except ValueError:
+        raise ValueError(f"arguments to '{parts[0]}' must be integers") from None
+    return name, args
 
 class Flower:
     def __init__(self, name, color, size):
@@ -34,6 +92,8 @@ class GameBoard:
         self.rows = rows
         self.cols = cols
         self.grid = [[None for _ in range(cols)] for _ in range(rows)]
+        self.zobrist = DEFAULT_TABLE
+        self.zobrist_hash = 0  # XOR of the keys of every placed flower
 
     def place_flower(self, flower, row, col):
         """Places a flower on the board, handling errors."""
@@ -41,14 +101,30 @@ class GameBoard:
         if self.grid[row][col] is not None:
             raise ValueError(f"That spot is already occupied by a {self.grid[row][col].name}")
         self.grid[row][col] = flower
+        self.zobrist_hash ^= self.zobrist.key(row, col, flower.name)
 
     def remove_flower(self, row, col):
         """Removes a flower from the board, handling errors."""
         self._validate_coordinates(row, col)
         if self.grid[row][col] is None:
             raise ValueError("There is no flower at this spot.")
+        self.zobrist_hash ^= self.zobrist.key(row, col, self.grid[row][col].name)
         self.grid[row][col] = None
 
+    def clear(self):
+        """Removes every flower from the board and returns the removed (row, col, flower) cells."""
+        cleared = [(row, col, flower) for row, cells in enumerate(self.grid)
+                   for col, flower in enumerate(cells) if flower is not None]
+        self.grid = [[None for _ in range(self.cols)] for _ in range(self.rows)]
+        self.zobrist_hash = 0
+        return cleared
+
+    def restore(self, cells):
+        """Puts (row, col, flower) cells back on the board, skipping cells that have since been filled."""
+        for row, col, flower in cells:
+            if self.grid[row][col] is None:
+                self.place_flower(flower, row, col)
+
     def get_arrangement(self):
         """Returns a list of flowers in the arrangement."""
         return [flower for row in self.grid for flower in row if flower]
@@ -73,8 +149,8 @@ class GameBoard:
 
 
 class BloomBurstGame:
-    def __init__(self, rows=5, cols=5):
-        self.board = GameBoard(rows, cols)
+    def __init__(self, rows=5, cols=5, leaderboard=None, player_name="Player", level=1, rng=None, telemetry=None):
+        self.state = GameState(board=GameBoard(rows, cols))  # Shared with the level and power-up effects
         self.available_flowers = {
             1: Flower("Rose", "red", "small"),
             2: Flower("Tulip", "yellow", "medium"),
@@ -83,7 +159,6 @@ class BloomBurstGame:
             5: Flower("Lavender", "purple", "small")
         }
         self.current_order = None
-        self.score = 0
         self.zen_mode = False
         self.possible_colors = set(flower.color for flower in self.available_flowers.values())
         self.possible_sizes = set(flower.size for flower in self.available_flowers.values())
@@ -91,15 +166,37 @@ class BloomBurstGame:
         self.game_over = False
         self.rows = rows
         self.cols = cols
+        self.leaderboard = leaderboard
+        self.player_name = player_name
+        self.level = level
+        self.evaluation_cache = EvaluationCache()
+        self.rng = rng if rng is not None else random  # Seedable source for order generation
+        self.telemetry = telemetry  # Optional telemetry.EventLog
+
+    @property
+    def board(self):
+        return self.state.board
+
+    @board.setter
+    def board(self, board):
+        self.state.board = board
+
+    @property
+    def score(self):
+        return self.state.score
+
+    @score.setter
+    def score(self, score):
+        self.state.score = score
 
     def generate_order(self):
         """Generates a random order based on available flower attributes."""
         order_requirements = {}
-        num_requirements = random.randint(0, len(self.attributes))  # Random number of requirements
-        selected_attributes = random.sample(list(self.attributes.keys()), num_requirements)
+        num_requirements = self.rng.randint(0, len(self.attributes))  # Random number of requirements
+        selected_attributes = self.rng.sample(list(self.attributes.keys()), num_requirements)
 
         for attr in selected_attributes:
-            order_requirements[attr] = random.choice(list(self.attributes[attr]))
+            order_requirements[attr] = self.rng.choice(sorted(self.attributes[attr]))  # Sorted so seeded runs repeat
 
         self.current_order = Order(order_requirements)
 
@@ -171,8 +268,7 @@ class BloomBurstGame:
                 row = int(input(f"Enter row (0-{self.rows - 1}): "))
                 col = int(input(f"Enter column (0-{self.cols - 1}): "))
 
-                flower = self.available_flowers[flower_index]
-                self.board.place_flower(flower, row, col)
+                flower = self.place_flower(flower_index, row, col)
                 print(f"Placed {flower.name} at ({row}, {col}).")
                 break
 
@@ -187,7 +283,7 @@ class BloomBurstGame:
             try:
                 row = int(input(f"Enter row to remove flower from (0-{self.rows - 1}): "))
                 col = int(input(f"Enter column to remove flower from (0-{self.cols - 1}): "))
-                self.board.remove_flower(row, col)
+                self.remove_flower(row, col)
                 print(f"Removed flower from ({row}, {col}).")
                 break
 
@@ -196,19 +292,127 @@ class BloomBurstGame:
             except Exception as e:
                 print(f"An unexpected error occurred: {e}")
 
+    def place_flower(self, flower_index, row, col):
+        """Places flower number flower_index on the board and returns it.  Raises ValueError for invalid moves."""
+        started = time.perf_counter()
+        flower = self.available_flowers.get(flower_index)
+        try:
+            if flower is None:
+                raise ValueError("Invalid flower number.")
+            self.board.place_flower(flower, row, col)
+        except ValueError:
+            self._record_event('place', row, col, flower, started, 'error')
+            raise
+        self._record_event('place', row, col, flower, started, 'ok')
+        return flower
+
+    def remove_flower(self, row, col):
+        """Removes the flower at (row, col).  Raises ValueError for invalid moves."""
+        started = time.perf_counter()
+        try:
+            self.board.remove_flower(row, col)
+        except ValueError:
+            self._record_event('remove', row, col, None, started, 'error')
+            raise
+        self._record_event('remove', row, col, None, started, 'ok')
+
+    def _record_event(self, action, row, col, flower, started, outcome):
+        """Sends an action to the telemetry log, if one is attached."""
+        if self.telemetry is not None:
+            self.telemetry.record(action, row, col, flower.name if flower else None,
+                                  time.perf_counter() - started, outcome)
+
+    def is_order_fulfilled(self):
+        """Checks the current order against the board, cached by the board's Zobrist hash."""
+        key = (self.board.zobrist_hash, tuple(sorted(self.current_order.requirements.items())))
+        return self.evaluation_cache.get_or_compute(
+            key, lambda: self.current_order.check_fulfillment(self.board.get_arrangement())
+        )
+
+    def resolve_order(self):
+        """
+        Applies the rules for checking the current order: a fulfilled order awards
+        points (scaled by the score multiplier) and a new order is generated; a failed
+        order ends the game unless in Zen mode.  Returns the points awarded.
+        """
+        started = time.perf_counter()
+        if self.is_order_fulfilled():
+            points = ORDER_REWARD * self.state.score_multiplier
+            self.score += points  # Award points
+            self.generate_order()  # Generate new order
+            self._record_event('check', -1, -1, None, started, 'fulfilled')
+            return points
+        if not self.zen_mode:  # Added Zen Mode check
+            self.game_over = True
+        self._record_event('check', -1, -1, None, started, 'game_over' if self.game_over else 'failed')
+        return 0
+
     def check_order_action(self):
         """Handles the action of checking the order fulfillment."""
-        arrangement = self.board.get_arrangement()
-        if self.current_order.check_fulfillment(arrangement):
+        if self.resolve_order():
             print("Congratulations! You fulfilled the order!")
-            self.score += 100  # Award points
             print(f"Score: {self.score}")
-            self.generate_order()  # Generate new order
         else:
             print("The arrangement does not meet the requirements.")
-            if not self.zen_mode:  # Added Zen Mode check
+            if self.game_over:
                 print("Game Over")
-                self.game_over = True
+                self.submit_score()
+
+    def execute_command(self, command, args):
+        """
+        Applies one parsed script command without prompting.  Returns a result line
+        for checks and None otherwise; invalid moves raise ValueError.
+        """
+        if command == 'place':
+            self.place_flower(*args)
+        elif command == 'remove':
+            self.remove_flower(*args)
+        elif command == 'check':
+            if self.resolve_order():
+                return f"Order fulfilled! Score: {self.score}"
+            return "Order not fulfilled." + (" Game Over" if self.game_over else "")
+        elif command == 'exit':
+            self.game_over = True
+        return None
+
+    def run_script(self, lines, quiet=False, out=None):
+        """
+        Runs a stream of script commands without prompts or board redraws.
+        Malformed commands count as errors, like invalid moves, and the script carries on.
+
+        Args:
+            lines (iterable): Lines of commands, e.g. an open file or sys.stdin.
+            quiet (bool): If True, only the final summary is printed.
+            out: Stream that results are written to as they are produced (defaults to sys.stdout).
+
+        Returns:
+            int: The number of commands that failed.
+        """
+        if self.current_order is None:
+            self.generate_order()
+        applied = errors = 0
+        write = (out or sys.stdout).write  # Streams are buffered, so writing per result stays cheap.
+
+        def report_error(line_number, message):
+            nonlocal errors
+            errors += 1
+            if not quiet:
+                write(f"line {line_number}: Error: {message}\n")
+
+        for line_number, command, args in parse_commands(lines, on_error=report_error):
+            if self.game_over:
+                break
+            try:
+                result = self.execute_command(command, args)
+            except ValueError as e:
+                report_error(line_number, e)
+                continue
+            applied += 1
+            if result is not None and not quiet:
+                write(result + "\n")
+        write(f"Commands applied: {applied}, errors: {errors}, score: {self.score}, "
+                  f"game over: {'yes' if self.game_over else 'no'}\n")
+        return errors
 
     def show_instructions(self):
         print("\n--- Instructions ---")
@@ -222,11 +426,48 @@ class BloomBurstGame:
         print("Fulfilling orders earns you points. The game ends if you fail an order in normal mode.")
         print("In Zen mode, you can continue playing even if you fail an order.")
 
+    def submit_score(self, quiet=False):
+        """Records the final score on the leaderboard, if one is attached, and prints its rank unless quiet."""
+        if self.leaderboard is None:
+            return
+        self.leaderboard.submit_score(self.level, self.player_name, self.score)
+        if not quiet:
+            rank = self.leaderboard.rank_of_score(self.level, self.score)
+            print(f"Leaderboard rank for level {self.level}: #{rank}")
+
     def exit_game(self):
         print("Thanks for playing Bloom Burst!")
         self.game_over = True
+        self.submit_score()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bloom Burst: a floral puzzle adventure.")
+    parser.add_argument("--script", metavar="FILE",
+                        help="run commands from FILE ('-' for stdin) instead of prompting, e.g. 'p 1 0 0; r 0 0; c'")
+    parser.add_argument("--zen", action="store_true", help="play in Zen mode (script mode only)")
+    parser.add_argument("--quiet", action="store_true", help="print only the final summary (script mode only)")
+    parser.add_argument("--submit-as", metavar="PLAYER",
+                        help="submit the script's final score to the leaderboard as PLAYER (script mode only; "
+                             "replayed scripts are not submitted otherwise)")
+    args = parser.parse_args(argv)
+
+    if args.script is None:
+        with Leaderboard() as leaderboard:
+            BloomBurstGame(leaderboard=leaderboard).start_game()
+        return 0
+
+    with (Leaderboard() if args.submit_as else contextlib.nullcontext()) as leaderboard:
+        game = BloomBurstGame(leaderboard=leaderboard, player_name=args.submit_as or "Player")
+        game.zen_mode = args.zen
+        if args.script == '-':
+            errors = game.run_script(sys.stdin, quiet=args.quiet)
+        else:
+            with open(args.script, "r") as f:
+                errors = game.run_script(f, quiet=args.quiet)
+        game.submit_score(quiet=args.quiet)
+        return 1 if errors else 0
 
 
 if __name__ == "__main__":
-    game = BloomBurstGame()
-    game.start_game()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,27 @@
+class GameState:
+    """
+    The mutable state shared by a game, its level and its power-up effects.
+
+    Uses __slots__ so effects read and write typed attributes directly instead of
+    looking up string keys in a dict.
+
+    Attributes:
+        score (int): The player's score.
+        score_multiplier (int): Multiplier applied to points earned.
+        time_remaining (float): Seconds left on the order timer, or None when the game is untimed.
+        board: The playing field.  Must provide a clear() method (GameBoard or Level4).
+        tick (int): Number of power-up update ticks processed so far.
+    """
+
+    __slots__ = ("score", "score_multiplier", "time_remaining", "board", "tick")
+
+    def __init__(self, board=None, score=0, score_multiplier=1, time_remaining=None):
+        self.score = score
+        self.score_multiplier = score_multiplier
+        self.time_remaining = time_remaining
+        self.board = board
+        self.tick = 0
+
+    def __repr__(self):
+        return (f"GameState(score={self.score}, score_multiplier={self.score_multiplier}, "
+                f"time_remaining={self.time_remaining}, tick={self.tick})")
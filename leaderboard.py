@@ -0,0 +1,332 @@
+import bisect
+import queue
+import sqlite3
+import threading
+import time
+
+
+class ScoreHistogram:
+    """
+    Counts of integer scores supporting O(log D) inserts and "how many scores
+    are higher" queries.
+
+    A Fenwick tree holds the count of each score bucket, so both operations
+    touch only log2(buckets) tree nodes.  Buckets start one score wide; the
+    covered range doubles whenever a score falls outside it, and once there
+    are max_buckets buckets further growth widens the buckets instead, which
+    keeps memory bounded for sparse scores.  Each bucket keeps its exact
+    per-score counts, so ranks stay exact.
+    """
+
+    def __init__(self, max_buckets=1 << 20, initial_buckets=1024):
+        """
+        Args:
+            max_buckets (int): Upper bound on the number of Fenwick tree buckets.
+            initial_buckets (int): Buckets allocated around the first score.
+        """
+        self.max_buckets = max_buckets
+        self.initial_buckets = initial_buckets
+        self.total = 0
+        self._lo = None    # Lowest score covered by bucket 0
+        self._shift = 0    # Bucket width is 2 ** shift scores
+        self._tree = [0]   # 1-based Fenwick tree over bucket counts
+        self._buckets = {}  # bucket index -> {score: count}
+
+    def add(self, score, count=1):
+        """Adds count occurrences of score."""
+        if self._lo is None:
+            self._lo = score - self.initial_buckets // 2
+            self._tree = [0] * (self.initial_buckets + 1)
+        while not self._lo <= score < self._lo + ((len(self._tree) - 1) << self._shift):
+            self._grow(score)
+        index = (score - self._lo) >> self._shift
+        bucket = self._buckets.setdefault(index, {})
+        bucket[score] = bucket.get(score, 0) + count
+        self.total += count
+        tree = self._tree
+        size = len(tree) - 1
+        i = index + 1
+        while i <= size:
+            tree[i] += count
+            i += i & -i
+
+    def count_above(self, score):
+        """Returns how many scores are strictly greater than score."""
+        if self._lo is None or score < self._lo:
+            return self.total
+        index = (score - self._lo) >> self._shift
+        if index >= len(self._tree) - 1:
+            return 0
+        at_or_below = 0
+        tree = self._tree
+        i = index + 1
+        while i > 0:
+            at_or_below += tree[i]
+            i -= i & -i
+        above = self.total - at_or_below
+        bucket = self._buckets.get(index)
+        if bucket and self._shift:
+            above += sum(count for value, count in bucket.items() if value > score)
+        return above
+
+    def _grow(self, score):
+        """Doubles the covered range towards score, then rebuilds the tree."""
+        size = len(self._tree) - 1
+        if score < self._lo:
+            self._lo -= size << self._shift
+        if size * 2 <= self.max_buckets:
+            size *= 2
+        else:
+            self._shift += 1
+        entries = [item for bucket in self._buckets.values() for item in bucket.items()]
+        self._buckets = {}
+        tree = [0] * (size + 1)
+        for value, count in entries:
+            index = (value - self._lo) >> self._shift
+            bucket = self._buckets.setdefault(index, {})
+            bucket[value] = bucket.get(value, 0) + count
+            tree[index + 1] += count
+        for i in range(1, size + 1):  # Linear-time Fenwick construction
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+
+class Leaderboard:
+    """
+    Local, SQLite-backed leaderboard for Bloom Burst scores.
+
+    Scores are written to a WAL-mode database by a background writer thread in
+    batches, so submitting a score never waits on disk I/O.  Reads are served
+    from in-memory caches (a top-k list and a score histogram per level) that
+    are updated as soon as a score is submitted; rank queries and cache
+    updates are O(log distinct scores).
+    """
+
+    def __init__(self, path="leaderboard.db", top_k=100, batch_size=500, flush_interval=0.05):
+        """
+        Opens (or creates) the leaderboard database and starts the writer thread.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            top_k (int): Number of entries cached per level for top-N queries.
+            batch_size (int): Maximum number of scores written per transaction.
+            flush_interval (float): Seconds the writer waits for more scores before committing.
+        """
+        self.path = path
+        self.top_k = top_k
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._top = {}            # level -> sorted list of (-score, seq, player)
+        self._histogram = {}      # level -> ScoreHistogram
+        self._best = {}           # (level, player) -> best score
+        self._seq = 0
+
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._write_error = None
+        self.failed_writes = 0  # Scores lost to database errors
+
+        connection = self._connect()
+        try:
+            self._create_schema(connection)
+            self._load_cache(connection)
+        finally:
+            connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="leaderboard-writer", daemon=True)
+        self._writer.start()
+
+    def submit_score(self, level, player, score):
+        """
+        Records a score.  Caches are updated immediately; the database write is batched.
+
+        Args:
+            level (int): The level the score was earned on.
+            player (str): The player's name.
+            score (int): The final score.
+        """
+        if self._closed:
+            raise ValueError("Cannot submit scores to a closed leaderboard.")
+        submitted_at = time.time()
+        with self._lock:
+            self._cache_score(level, player, score)
+        self._queue.put((level, player, score, submitted_at))
+
+    def top_scores(self, level, n=10):
+        """
+        Returns the best n scores for a level as a list of (player, score) tuples.
+
+        Args:
+            level (int): The level to query.
+            n (int): Number of entries to return (at most top_k).
+        """
+        with self._lock:
+            entries = self._top.get(level, [])[:n]
+        return [(player, -neg_score) for neg_score, _, player in entries]
+
+    def rank_of_score(self, level, score):
+        """Returns the 1-based rank a score would hold on a level's leaderboard."""
+        with self._lock:
+            histogram = self._histogram.get(level)
+            return 1 if histogram is None else 1 + histogram.count_above(score)
+
+    def player_rank(self, level, player):
+        """Returns the rank of a player's best score on a level, or None if they have no score."""
+        best = self._best.get((level, player))
+        if best is None:
+            return None
+        return self.rank_of_score(level, best)
+
+    def best_score(self, level, player):
+        """Returns a player's best score on a level, or None if they have no score."""
+        return self._best.get((level, player))
+
+    def flush(self):
+        """
+        Blocks until every score submitted so far has been handled by the writer.
+
+        Returns immediately once the leaderboard is closed (close() already flushed).
+
+        Raises:
+            sqlite3.Error: If the writer failed to commit a batch since the last flush.
+        """
+        if self._closed or not self._writer.is_alive():
+            self._raise_write_error()
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(0.1):
+            if not self._writer.is_alive():
+                break
+        self._raise_write_error()
+
+    def _raise_write_error(self):
+        """Re-raises (once) the last error the writer thread hit."""
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        """Flushes pending scores and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _connect(self):
+        """Opens a connection configured for concurrent readers and a single writer."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _create_schema(self, connection):
+        """Creates the scores table and its (level, score) index."""
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " id INTEGER PRIMARY KEY,"
+            " level INTEGER NOT NULL,"
+            " player TEXT NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " submitted_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_scores_level_score ON scores (level, score DESC)")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_scores_level_player ON scores (level, player)")
+        connection.commit()
+
+    def _load_cache(self, connection):
+        """Rebuilds the in-memory caches from the scores already on disk."""
+        for level, score, count in connection.execute(
+            "SELECT level, score, COUNT(*) FROM scores GROUP BY level, score ORDER BY level, score"
+        ):
+            self._histogram.setdefault(level, ScoreHistogram()).add(score, count)
+
+        for level, player, best in connection.execute(
+            "SELECT level, player, MAX(score) FROM scores GROUP BY level, player"
+        ):
+            self._best[(level, player)] = best
+
+        for level in self._histogram:
+            rows = connection.execute(
+                "SELECT player, score FROM scores WHERE level = ? ORDER BY score DESC, id LIMIT ?",
+                (level, self.top_k),
+            )
+            top = self._top.setdefault(level, [])
+            for player, score in rows:
+                self._seq += 1
+                top.append((-score, self._seq, player))
+
+    def _cache_score(self, level, player, score):
+        """Adds a score to the top-k list, histogram and best-score map.  Caller holds the lock."""
+        self._seq += 1
+        top = self._top.setdefault(level, [])
+        entry = (-score, self._seq, player)
+        if len(top) < self.top_k or entry < top[-1]:
+            bisect.insort(top, entry)
+            if len(top) > self.top_k:
+                top.pop()
+
+        histogram = self._histogram.get(level)
+        if histogram is None:
+            histogram = self._histogram[level] = ScoreHistogram()
+        histogram.add(score)
+
+        key = (level, player)
+        if self._best.get(key) is None or score > self._best[key]:
+            self._best[key] = score
+
+    def _write_loop(self):
+        """Drains the submission queue and writes scores in batched transactions."""
+        connection = self._connect()
+        try:
+            running = True
+            while running:
+                item = self._queue.get()
+                batch = []
+                waiters = []
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is None:
+                        running = False
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+
+                try:
+                    if batch:
+                        with connection:
+                            connection.executemany(
+                                "INSERT INTO scores (level, player, score, submitted_at) VALUES (?, ?, ?, ?)",
+                                batch,
+                            )
+                except sqlite3.Error as e:
+                    # Keep the writer alive; the scores stay in the in-memory caches.
+                    self.failed_writes += len(batch)
+                    self._write_error = e
+                finally:
+                    for waiter in waiters:
+                        waiter.set()
+        finally:
+            connection.close()
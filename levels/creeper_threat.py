@@ -0,0 +1,190 @@
+import heapq
+
+SOURCE = 0
+OPEN = 1
+BLOCKED = 2
+
+
+class CreeperThreatMap:
+    """
+    Distance field showing how many creeper growth steps each cell is from the
+    nearest creeper, for Level 4 hints.
+
+    Creeper cells ('C') and the creeper start locations are the sources; creepers
+    travel through empty cells ('.') and are stopped by flowers.  The field is
+    built once with a multi-source BFS and then repaired locally when cells
+    change, instead of being recomputed from scratch.
+    """
+
+    def __init__(self, grid, start_locations, horizon=None):
+        """
+        Args:
+            grid (list): The level grid (list of rows of symbols).  It is read, never modified.
+            start_locations (list): (row, col) creeper roots that always count as sources.
+            horizon (int): Distance at which a cell stops counting towards the threat total.
+                           Defaults to rows + cols.
+        """
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if self.rows else 0
+        self.unreachable = self.rows * self.cols  # Larger than any real distance
+        self.horizon = horizon if horizon is not None else self.rows + self.cols
+        self.start_cells = {r * self.cols + c for r, c in start_locations}
+        self.neighbours = [self._neighbours(i) for i in range(self.rows * self.cols)]
+        self.version = 0
+        self._rankings = None
+        self._rankings_version = -1
+        self.rebuild()
+
+    def _neighbours(self, index):
+        row, col = divmod(index, self.cols)
+        cells = []
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < self.rows and 0 <= c < self.cols:
+                cells.append(r * self.cols + c)
+        return cells
+
+    def _status(self, index):
+        """Classifies a cell as SOURCE, OPEN or BLOCKED from the current grid."""
+        if index in self.start_cells:
+            return SOURCE
+        symbol = self.grid[index // self.cols][index % self.cols]
+        if symbol == 'C':
+            return SOURCE
+        if symbol == '.':
+            return OPEN
+        return BLOCKED
+
+    def rebuild(self):
+        """Recomputes the whole distance field with a multi-source BFS."""
+        self.distances = [self.unreachable] * (self.rows * self.cols)
+        frontier = []
+        for index in range(self.rows * self.cols):
+            if self._status(index) == SOURCE:
+                self.distances[index] = 0
+                frontier.append(index)
+        while frontier:
+            next_frontier = []
+            for index in frontier:
+                step = self.distances[index] + 1
+                for neighbour in self.neighbours[index]:
+                    if self.distances[neighbour] > step and self._status(neighbour) == OPEN:
+                        self.distances[neighbour] = step
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        self.version += 1
+
+    def update(self, cells):
+        """
+        Repairs the distance field after the given cells changed on the grid.
+
+        Args:
+            cells (iterable): (row, col) cells whose symbol changed.
+        """
+        self._repair(self.distances, [r * self.cols + c for r, c in cells], self._status)
+        self.version += 1
+
+    def _repair(self, distances, changed, status):
+        """
+        Locally re-relaxes distances around changed cells.
+
+        Cells whose shortest path may have run through a changed cell are
+        invalidated, re-seeded from their valid neighbours, and then relaxed
+        outwards with a small Dijkstra pass that also spreads any decreases.
+        """
+        unreachable = self.unreachable
+        affected = set(changed)
+        stack = list(changed)
+        while stack:
+            index = stack.pop()
+            child_distance = distances[index] + 1
+            if child_distance >= unreachable:
+                continue
+            for neighbour in self.neighbours[index]:
+                if neighbour not in affected and distances[neighbour] == child_distance:
+                    affected.add(neighbour)
+                    stack.append(neighbour)
+
+        for index in affected:
+            distances[index] = unreachable
+
+        heap = []
+        for index in affected:
+            cell_status = status(index)
+            if cell_status == SOURCE:
+                best = 0
+            elif cell_status == OPEN:
+                best = unreachable
+                for neighbour in self.neighbours[index]:
+                    if neighbour not in affected and distances[neighbour] + 1 < best and status(neighbour) != BLOCKED:
+                        best = distances[neighbour] + 1
+            else:
+                continue
+            if best < unreachable:
+                distances[index] = best
+                heapq.heappush(heap, (best, index))
+
+        while heap:
+            distance, index = heapq.heappop(heap)
+            if distance > distances[index]:
+                continue
+            for neighbour in self.neighbours[index]:
+                if distance + 1 < distances[neighbour] and status(neighbour) == OPEN:
+                    distances[neighbour] = distance + 1
+                    heapq.heappush(heap, (distance + 1, neighbour))
+
+    def distance(self, row, col):
+        """Returns how many growth steps (row, col) is from a creeper, or None if creepers can't reach it."""
+        distance = self.distances[row * self.cols + col]
+        return None if distance >= self.unreachable else distance
+
+    def _threat(self, distances):
+        return sum(self.horizon - d for d in distances if d < self.horizon)
+
+    def total_threat(self):
+        """Sum over reachable cells of (horizon - distance): higher means creepers are closer to more cells."""
+        return self._threat(self.distances)
+
+    def best_pruning_locations(self, n=None):
+        """
+        Ranks every 2x2 pruning shears location by how much it would reduce the threat.
+
+        Rankings are cached until the grid next changes, so this is cheap to call every tick.
+
+        Args:
+            n (int): Number of locations to return, or None for all of them.
+
+        Returns:
+            list: (row, col, threat_reduction, creepers_cleared) tuples, best first.
+                  Locations that would clear nothing are omitted.
+        """
+        if self._rankings_version != self.version:
+            self._rankings = self._rank_pruning_locations()
+            self._rankings_version = self.version
+        return self._rankings if n is None else self._rankings[:n]
+
+    def _rank_pruning_locations(self):
+        current_threat = self.total_threat()
+        rankings = []
+        for row in range(self.rows - 1):
+            for col in range(self.cols - 1):
+                cleared = [
+                    r * self.cols + c
+                    for r in (row, row + 1)
+                    for c in (col, col + 1)
+                    if self.grid[r][c] == 'C'
+                ]
+                if not cleared:
+                    continue
+                opened = set(cleared)
+
+                def status(index, opened=opened):
+                    if index in opened and index not in self.start_cells:
+                        return OPEN
+                    return self._status(index)
+
+                distances = list(self.distances)
+                self._repair(distances, cleared, status)
+                rankings.append((row, col, current_threat - self._threat(distances), len(cleared)))
+        rankings.sort(key=lambda entry: (-entry[2], -entry[3], entry[0], entry[1]))
+        return rankings
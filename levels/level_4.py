@@ -1,4 +1,84 @@
 import random
+import time
+
+import numpy as np
+
+from game_state import GameState
+from levels.creeper_threat import CreeperThreatMap
+from zobrist import DEFAULT_TABLE, EvaluationCache
+
+
+def score_grids(grids, sunflower_count_required=8, lavender_count_required=6,
+                crimson_rose_count_required=4, max_creeper_coverage=10,
+                min_golden_ratio_score=50, min_symmetry_score=75):
+    """
+    Scores a stack of candidate Level 4 grids without touching any level state.
+
+    Mirrors Level4.check_order_fulfilled, calculate_golden_ratio_score and
+    calculate_symmetry_score exactly, but evaluates all N grids with a few
+    vectorized operations.  Creeper coverage is the number of 'C' cells, as
+    recalculated by grow_creepers.
+
+    Args:
+        grids: Array-like of shape (N, rows, cols) holding the grid symbols ('.', '#', 'S', 'L', 'C', 'W').
+        sunflower_count_required (int): Minimum sunflowers ('S' or '#').
+        lavender_count_required (int): Minimum lavender ('L').
+        crimson_rose_count_required (int): Minimum crimson roses ('C', shared with creepers).
+        max_creeper_coverage (int): Maximum creeper cells.
+        min_golden_ratio_score (float): Minimum golden ratio score, as a percentage.
+        min_symmetry_score (float): Minimum symmetry score, as a percentage.
+
+    Returns:
+        dict: Arrays of length N keyed by "sunflower_count", "lavender_count",
+              "crimson_rose_count", "creeper_coverage", "golden_ratio_score",
+              "symmetry_score" and "fulfilled".
+    """
+    grids = np.asarray(grids, dtype='<U1')
+    if grids.ndim == 2:
+        grids = grids[np.newaxis]
+    _, rows, cols = grids.shape
+
+    sunflower_count = np.count_nonzero((grids == 'S') | (grids == '#'), axis=(1, 2))
+    lavender_count = np.count_nonzero(grids == 'L', axis=(1, 2))
+    creepers = grids == 'C'
+    creeper_coverage = np.count_nonzero(creepers, axis=(1, 2))
+    crimson_rose_count = creeper_coverage  # Roses and creepers share the 'C' symbol in the single-grid check.
+
+    # Golden ratio: cells whose 3x3 neighbourhood (clipped at the edges) holds 3+ flowers.
+    flowers = np.pad((grids != '.') & ~creepers, ((0, 0), (1, 1), (1, 1))).astype(np.int8)
+    neighbourhood = sum(
+        flowers[:, 1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        for dr in (-1, 0, 1)
+        for dc in (-1, 0, 1)
+    )
+    golden_squares = np.count_nonzero(neighbourhood >= 3, axis=(1, 2))
+    golden_ratio_score = (golden_squares / (rows * cols)) * 100
+
+    # Symmetry: 2-fold rotational symmetry, skipping the center cell.
+    matches = grids == grids[:, ::-1, ::-1]
+    matches[:, rows // 2, cols // 2] = False
+    total_pairs = rows * cols - 1
+    symmetry_score = (np.count_nonzero(matches, axis=(1, 2)) / total_pairs) * 100
+
+    fulfilled = (
+        (sunflower_count >= sunflower_count_required)
+        & (lavender_count >= lavender_count_required)
+        & (crimson_rose_count >= crimson_rose_count_required)
+        & (creeper_coverage <= max_creeper_coverage)
+        & (golden_ratio_score >= min_golden_ratio_score)
+        & (symmetry_score >= min_symmetry_score)
+    )
+
+    return {
+        "sunflower_count": sunflower_count,
+        "lavender_count": lavender_count,
+        "crimson_rose_count": crimson_rose_count,
+        "creeper_coverage": creeper_coverage,
+        "golden_ratio_score": golden_ratio_score,
+        "symmetry_score": symmetry_score,
+        "fulfilled": fulfilled,
+    }
+
 
 class Level4:
     """
@@ -8,7 +88,7 @@ class Level4:
     harmony (Golden Ratio) and symmetry rules.
     """
 
-    def __init__(self):
+    def __init__(self, evaluation_cache=None, state=None, telemetry=None):
         self.grid_size = (7, 7)
         self.grid = [['.' for _ in range(self.grid_size[1])] for _ in range(self.grid_size[0])]
         self.creeper_start_locations = [(1, 1), (5, 5)]  # Coordinates (row, col)
@@ -36,6 +116,21 @@ class Level4:
         self.game_over = False
         self.message = ""
 
+        # Incremental Zobrist hash of the grid, updated by XOR on every cell change.
+        self.zobrist = DEFAULT_TABLE
+        self.zobrist_hash = self.zobrist.hash_grid(self.grid, empty='.')
+        self.evaluation_cache = evaluation_cache if evaluation_cache is not None else EvaluationCache()
+
+        # Score, multiplier and timer shared with the game and power-up effects.  The level acts as
+        # the board only when the state has none, so a game's GameBoard is never replaced.
+        self.state = state if state is not None else GameState()
+        if self.state.board is None:
+            self.state.board = self
+        self.telemetry = telemetry  # Optional telemetry.EventLog
+
+        # Distance of every cell from the creepers, repaired incrementally as cells change.
+        self.threat_map = CreeperThreatMap(self.grid, self.creeper_start_locations)
+
 
     def display_grid(self):
         """Prints the current state of the grid to the console (for debugging/CLI)."""
@@ -48,6 +143,13 @@ class Level4:
         Places a flower of the specified type at the given coordinates.
         Handles flower availability and errors.
         """
+        started = time.perf_counter()
+        placed = self._place_flower(row, col, flower_type)
+        self._record_event("place", row, col, flower_type, started, "ok" if placed else "rejected")
+        return placed
+
+    def _place_flower(self, row, col, flower_type):
+        """Does the work of place_flower.  Returns True if the flower was placed."""
         if self.game_over:
             self.message = "The game is over.  You cannot place any more flowers."
             return False
@@ -69,6 +171,8 @@ class Level4:
             return False
 
         self.grid[row][col] = flower_type[0].upper() # Use first letter as symbol (S, L, C, W)
+        self.zobrist_hash ^= self.zobrist.key(row, col, self.grid[row][col])
+        self.threat_map.update([(row, col)])
         if self.available_flowers[flower_type]["count"] != float('inf'): #Decrease count if the flower is limited
             self.available_flowers[flower_type]["count"] -= 1
 
@@ -77,11 +181,48 @@ class Level4:
 
 
 
+    def clear(self):
+        """
+        Clears every flower and creeper from the grid, keeping the pre-placed sunflower.
+        Returns the cleared (row, col, symbol) cells.
+        """
+        cleared = []
+        for r in range(self.grid_size[0]):
+            for c in range(self.grid_size[1]):
+                if self.grid[r][c] != '.' and (r, c) != self.pre_placed_sunflower:
+                    self.zobrist_hash ^= self.zobrist.key(r, c, self.grid[r][c])
+                    cleared.append((r, c, self.grid[r][c]))
+                    self.grid[r][c] = '.'
+        self.creeper_coverage = 0
+        self.threat_map.update((r, c) for r, c, _ in cleared)
+        return cleared
+
+
+    def restore(self, cells):
+        """Puts cleared (row, col, symbol) cells back, skipping cells that have since been filled."""
+        restored = []
+        for r, c, symbol in cells:
+            if self.grid[r][c] == '.':
+                self.grid[r][c] = symbol
+                self.zobrist_hash ^= self.zobrist.key(r, c, symbol)
+                restored.append((r, c))
+        self.creeper_coverage = sum(row.count('C') for row in self.grid)
+        self.threat_map.update(restored)
+
+
+
     def use_pruning_shears(self, row, col):
         """
         Uses the pruning shears to clear Creepers from a 2x2 area.
         Handles usage limits and errors.
         """
+        started = time.perf_counter()
+        used = self._use_pruning_shears(row, col)
+        self._record_event("prune", row, col, None, started, "ok" if used else "rejected")
+        return used
+
+    def _use_pruning_shears(self, row, col):
+        """Does the work of use_pruning_shears.  Returns True if the shears were used."""
         if self.game_over:
             self.message = "The game is over.  You cannot use pruning shears."
             return False
@@ -96,13 +237,17 @@ class Level4:
 
         self.pruning_shears_used += 1
 
+        pruned = []
         for r in range(row, row + 2):
             for c in range(col, col + 2):
                 if self.grid[r][c] == 'C':
                     self.grid[r][c] = '.'
+                    self.zobrist_hash ^= self.zobrist.key(r, c, 'C')
+                    pruned.append((r, c))
                     self.creeper_coverage -= 1
                     self.creeper_coverage = max(0, self.creeper_coverage) # Ensure creeper coverage doesn't go below 0.
 
+        self.threat_map.update(pruned)
         self.message = f"Pruning shears used successfully at ({row}, {col})."
         return True
 
@@ -128,6 +273,8 @@ class Level4:
             if adjacent_empty_cells and random.random() < self.creeper_growth_rate:
                 new_row, new_col = random.choice(adjacent_empty_cells)
                 self.grid[new_row][new_col] = 'C'
+                self.zobrist_hash ^= self.zobrist.key(new_row, new_col, 'C')
+                self.threat_map.update([(new_row, new_col)])
                 self.creeper_coverage += 1
 
 
@@ -195,6 +342,13 @@ class Level4:
 
     def check_order_fulfilled(self):
         """Checks if the flower arrangement fulfills the level's order requirements."""
+        started = time.perf_counter()
+        fulfilled = self._check_order_fulfilled()
+        self._record_event("check", -1, -1, None, started, "fulfilled" if fulfilled else "failed")
+        return fulfilled
+
+    def _check_order_fulfilled(self):
+        """Does the work of check_order_fulfilled."""
         if self.game_over:
             return False
 
@@ -216,8 +370,7 @@ class Level4:
             return False
 
         # Calculate Golden Ratio and Symmetry scores here, and potentially factor them into the overall fulfillment check.
-        self.calculate_golden_ratio_score() #Update the golden ratio score
-        self.calculate_symmetry_score() #Update the symmetry score
+        _, self.golden_ratio_score, self.symmetry_score = self.evaluate() #Cached by grid hash
 
         if self.golden_ratio_score < 50: #Minimum Golden Ratio score of 50% required for fulfillment
           self.message = f"Order not fulfilled: Insufficient Golden Ratio score (required: 50%, current: {self.golden_ratio_score}%)"
@@ -232,13 +385,51 @@ class Level4:
         return True
 
 
+    def evaluate(self):
+        """
+        Returns (fulfilled, golden_ratio_score, symmetry_score) for the current grid,
+        cached by its Zobrist hash.  Does not change the level's state.
+        """
+        def compute():
+            result = self.score_candidates([self.grid])
+            return (
+                bool(result["fulfilled"][0]),
+                float(result["golden_ratio_score"][0]),
+                float(result["symmetry_score"][0]),
+            )
+        return self.evaluation_cache.get_or_compute(self.zobrist_hash, compute)
+
+
+    def score_candidates(self, grids):
+        """
+        Scores a stack of candidate grids against this level's order without changing
+        the level's grid, scores or message.  See score_grids.
+        """
+        return score_grids(
+            grids,
+            sunflower_count_required=self.sunflower_count_required,
+            lavender_count_required=self.lavender_count_required,
+            crimson_rose_count_required=self.crimson_rose_count_required,
+            max_creeper_coverage=self.max_creeper_coverage,
+        )
+
+
     def update_level_state(self):
       """Updates the level state, growing creepers and checking for game over."""
       if not self.game_over:
+          started = time.perf_counter()
           self.grow_creepers()
           if self.creeper_coverage > self.max_creeper_coverage:
               self.game_over = True
               self.message = "Game Over: Creeper coverage exceeded the limit."
+          # Coverage is bounded by the grid size, so these outcome strings stay few once interned.
+          self._record_event("creeper_tick", -1, -1, None, started,
+                             "game_over" if self.game_over else f"coverage={self.creeper_coverage}")
+
+    def _record_event(self, action, row, col, flower_type, started, outcome):
+        """Sends an action to the telemetry log, if one is attached."""
+        if self.telemetry is not None:
+            self.telemetry.record(action, row, col, flower_type, time.perf_counter() - started, outcome)
 
 
 
@@ -256,6 +447,7 @@ class Level4:
           "pruning_shears_remaining": self.pruning_shears_available - self.pruning_shears_used,
           "golden_ratio_score": self.golden_ratio_score,
           "symmetry_score": self.symmetry_score,
+          "best_pruning_locations": self.threat_map.best_pruning_locations(3),
           "message": self.message,
           "game_over": self.game_over
       }
@@ -263,7 +455,7 @@ class Level4:
 
     def reset_level(self):
         """Resets the level to its initial state."""
-        self.__init__()  # Re-initialize the object
+        self.__init__(self.evaluation_cache, self.state, self.telemetry)  # Re-initialize the object, keeping cached evaluations and shared state
         self.message = "Level reset."
 
 
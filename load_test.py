@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+
+async def run_client(host, port, unix_path, kind, actions, latencies, rng):
+    """Opens one session and sends random actions, recording each round-trip latency."""
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    async def request(line):
+        started = time.perf_counter()
+        writer.write(line.encode() + b"\n")
+        reply = await reader.readline()
+        latencies.append(time.perf_counter() - started)
+        return reply
+
+    await request(f"new {kind} zen" if kind == "classic" else f"new {kind}")
+    for _ in range(actions):
+        roll = rng.random()
+        if kind == "classic":
+            if roll < 0.5:
+                line = f"p {rng.randint(1, 5)} {rng.randrange(5)} {rng.randrange(5)}"
+            elif roll < 0.8:
+                line = f"r {rng.randrange(5)} {rng.randrange(5)}"
+            else:
+                line = "c"
+        else:
+            if roll < 0.6:
+                line = f"p {rng.choice('SLCW')} {rng.randrange(7)} {rng.randrange(7)}"
+            elif roll < 0.7:
+                line = f"s {rng.randrange(6)} {rng.randrange(6)}"
+            elif roll < 0.85:
+                line = "hint"
+            else:
+                line = "c"
+        await request(line)
+    writer.write(b"quit\n")
+    writer.close()
+
+
+async def query_stats(host, port, unix_path):
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"stats\n")
+    reply = (await reader.readline()).decode()
+    writer.write(b"quit\n")
+    writer.close()
+    return json.loads(reply.split(" ", 1)[1])
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def load_test(host, port, unix_path, sessions, actions, kind, concurrency, seed):
+    """
+    Runs the load test and returns a report dict.
+
+    Sessions are opened in waves of at most `concurrency` simultaneous connections.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    before = await query_stats(host, port, unix_path)
+    started = time.perf_counter()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(index):
+        async with semaphore:
+            client_kind = kind if kind != "mixed" else ("classic" if index % 2 else "level4")
+            await run_client(host, port, unix_path, client_kind, actions, latencies, random.Random(rng.getrandbits(64)))
+
+    await asyncio.gather(*(limited(index) for index in range(sessions)))
+    elapsed = time.perf_counter() - started
+    after = await query_stats(host, port, unix_path)
+
+    latencies.sort()
+    server_cpu = after["cpu_seconds"] - before["cpu_seconds"]
+    utilisation = server_cpu / elapsed if elapsed else 0.0
+    return {
+        "sessions": sessions,
+        "requests": len(latencies),
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "server_cpu_seconds": round(server_cpu, 3),
+        "server_core_utilisation": round(utilisation, 3),
+        # The server is one process on one core; scale the hosted sessions to a fully busy core.
+        "sessions_per_core": round(sessions / utilisation) if utilisation else sessions,
+        "server_sessions_total": after["sessions"],
+    }
+
+
+def wait_for_server(process):
+    """Reads the spawned server's banner so the test starts once it is listening."""
+    line = process.stdout.readline()
+    if "listening" not in line:
+        raise RuntimeError(f"Server failed to start: {line.strip()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Bloom Burst game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--sessions", type=int, default=1000, help="number of sessions to open")
+    parser.add_argument("--actions", type=int, default=50, help="actions sent per session")
+    parser.add_argument("--concurrency", type=int, default=1000, help="maximum simultaneous connections")
+    parser.add_argument("--kind", choices=("classic", "level4", "mixed"), default="mixed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="start a local server for the duration of the test")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.spawn:
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")]
+        command += ["--unix", args.unix] if args.unix else ["--host", args.host, "--port", str(args.port)]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        wait_for_server(process)
+    try:
+        report = asyncio.run(load_test(args.host, args.port, args.unix, args.sessions, args.actions,
+                                       args.kind, args.concurrency, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
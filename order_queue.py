@@ -0,0 +1,182 @@
+import heapq
+import itertools
+import time
+
+
+class AttributeVocabulary:
+    """
+    Assigns one bit to every (attribute, value) pair seen in an order, so orders
+    and arrangements can be compared with integer bitmask operations.
+    """
+
+    def __init__(self):
+        self._bits = {}          # (attribute, value) -> bit
+        self._attributes = {}    # attribute -> {value: bit}
+        self._flower_masks = {}  # flower -> mask over the current vocabulary
+
+    def bit_for(self, attribute, value):
+        """Returns the bit for an attribute value, registering it if it is new."""
+        key = (attribute, value)
+        bit = self._bits.get(key)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[key] = bit
+            self._attributes.setdefault(attribute, {})[value] = bit
+            self._flower_masks.clear()  # Cached flower masks don't cover the new bit.
+        return bit
+
+    def compile(self, order):
+        """Compiles an Order's requirements into a single bitmask predicate."""
+        mask = 0
+        for attribute, value in order.requirements.items():
+            mask |= self.bit_for(attribute, value)
+        return mask
+
+    def flower_mask(self, flower):
+        """Returns the bits set by a flower's attribute values."""
+        mask = self._flower_masks.get(flower)
+        if mask is None:
+            mask = 0
+            for attribute, values in self._attributes.items():
+                mask |= values.get(getattr(flower, attribute, None), 0)
+            self._flower_masks[flower] = mask
+        return mask
+
+    def summarize(self, arrangement):
+        """Returns the attribute summary of an arrangement: the OR of its flowers' masks."""
+        summary = 0
+        for flower in set(arrangement):
+            summary |= self.flower_mask(flower)
+        return summary
+
+    def __len__(self):
+        return len(self._bits)
+
+
+class QueuedOrder:
+    """A pending customer order with its priority, deadline and compiled mask."""
+
+    __slots__ = ("order_id", "order", "priority", "deadline", "mask")
+
+    def __init__(self, order_id, order, priority, deadline, mask):
+        self.order_id = order_id
+        self.order = order
+        self.priority = priority
+        self.deadline = deadline
+        self.mask = mask
+
+    def sort_key(self):
+        """Orders are served highest priority first, then earliest deadline."""
+        deadline = self.deadline if self.deadline is not None else float('inf')
+        return (-self.priority, deadline, self.order_id)
+
+    def __repr__(self):
+        return f"QueuedOrder({self.order_id}, priority={self.priority}, deadline={self.deadline})"
+
+
+class OrderQueue:
+    """
+    Holds many pending Orders and matches all of them against an arrangement at once.
+
+    Orders with identical requirements share a compiled mask, so a match costs one
+    AND/compare per distinct mask on top of a single pass over the arrangement.
+    """
+
+    def __init__(self, vocabulary=None):
+        """
+        Args:
+            vocabulary (AttributeVocabulary): Shared bit assignment; a new one is created if omitted.
+        """
+        self.vocabulary = vocabulary if vocabulary is not None else AttributeVocabulary()
+        self._orders = {}       # order_id -> QueuedOrder
+        self._by_mask = {}      # mask -> {order_id: QueuedOrder}
+        self._deadlines = []    # heap of (deadline, order_id)
+        self._ids = itertools.count(1)
+
+    def add(self, order, priority=0, deadline=None):
+        """
+        Queues an order.
+
+        Args:
+            order (Order): The order to queue.
+            priority (int): Higher priorities are served first.
+            deadline (float): Time (as passed to expire) after which the order lapses, or None.
+
+        Returns:
+            int: The id of the queued order.
+        """
+        order_id = next(self._ids)
+        entry = QueuedOrder(order_id, order, priority, deadline, self.vocabulary.compile(order))
+        self._orders[order_id] = entry
+        self._by_mask.setdefault(entry.mask, {})[order_id] = entry
+        if deadline is not None:
+            heapq.heappush(self._deadlines, (deadline, order_id))
+        return order_id
+
+    def remove(self, order_id):
+        """Removes and returns a queued order, or None if it is not queued."""
+        entry = self._orders.pop(order_id, None)
+        if entry is None:
+            return None
+        group = self._by_mask[entry.mask]
+        del group[order_id]
+        if not group:
+            del self._by_mask[entry.mask]
+        return entry  # Any deadline heap entry is skipped lazily in expire().
+
+    def match(self, arrangement):
+        """
+        Returns every queued order the arrangement satisfies, best first.
+
+        Args:
+            arrangement (list): Flowers in the arrangement (see GameBoard.get_arrangement).
+        """
+        summary = self.vocabulary.summarize(arrangement)
+        matched = []
+        for mask, group in self._by_mask.items():
+            if mask & summary == mask:
+                matched.extend(group.values())
+        matched.sort(key=QueuedOrder.sort_key)
+        return matched
+
+    def pop_fulfilled(self, arrangement, limit=None):
+        """
+        Removes and returns the orders the arrangement satisfies, best first.
+
+        Args:
+            arrangement (list): Flowers in the arrangement.
+            limit (int): Maximum number of orders to fulfil, or None for all of them.
+        """
+        matched = self.match(arrangement)
+        if limit is not None:
+            matched = matched[:limit]
+        for entry in matched:
+            self.remove(entry.order_id)
+        return matched
+
+    def expire(self, now=None):
+        """
+        Removes and returns the orders whose deadline has passed.
+
+        Args:
+            now (float): The current time; defaults to time.time().
+        """
+        if now is None:
+            now = time.time()
+        expired = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, order_id = heapq.heappop(self._deadlines)
+            entry = self.remove(order_id)
+            if entry is not None:
+                expired.append(entry)
+        return expired
+
+    def pending(self):
+        """Returns all queued orders, best first."""
+        return sorted(self._orders.values(), key=QueuedOrder.sort_key)
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_id):
+        return order_id in self._orders
@@ -1,13 +1,64 @@
-```python
 import random
 import time
 
+from game_state import GameState
+
+
+class EffectJournal:
+    """
+    Records the inverse of every change a power-up's effect makes, so the effect
+    can be reverted without snapshotting the game state.
+
+    Inverses are relative (subtract what was added, divide what was multiplied,
+    refill only the cells that were cleared), so reverting one power-up leaves
+    the changes made by other, overlapping power-ups intact.
+    """
+
+    def __init__(self):
+        self.inverse_ops = []
+
+    def add(self, game_state, attribute, delta):
+        """Adds delta to a GameState attribute and records the subtraction."""
+        setattr(game_state, attribute, getattr(game_state, attribute) + delta)
+        self.inverse_ops.append(("add", attribute, -delta))
+
+    def scale(self, game_state, attribute, factor):
+        """Multiplies a GameState attribute by factor and records the division."""
+        setattr(game_state, attribute, getattr(game_state, attribute) * factor)
+        self.inverse_ops.append(("scale", attribute, factor))
+
+    def clear_board(self, game_state):
+        """Clears the board and records the cleared cells so they can be refilled."""
+        board = game_state.board
+        cleared = board.clear()
+        if cleared:
+            self.inverse_ops.append(("restore", board, cleared))
+
+    def revert(self, game_state):
+        """Undoes the recorded changes, newest first, and empties the journal."""
+        while self.inverse_ops:
+            op, target, value = self.inverse_ops.pop()
+            if op == "add":
+                setattr(game_state, target, getattr(game_state, target) + value)
+            elif op == "scale":
+                current = getattr(game_state, target)
+                if isinstance(current, int) and isinstance(value, int) and current % value == 0:
+                    setattr(game_state, target, current // value)
+                else:
+                    setattr(game_state, target, current / value)
+            elif op == "restore":
+                target.restore(value)
+
+    def __len__(self):
+        return len(self.inverse_ops)
+
+
 class PowerUp:
     """
     Represents a power-up in the Bloom Burst game.
     """
 
-    def __init__(self, name, description, duration, effect_function):
+    def __init__(self, name, description, duration, effect_function, revert_on_deactivate=True):
         """
         Initializes a new PowerUp instance.
 
@@ -16,102 +67,123 @@ class PowerUp:
             description (str): A brief description of what the power-up does.
             duration (int): The duration of the power-up's effect in seconds.
             effect_function (callable): A function that is called when the power-up is activated.
-                                       It should take the game state as input.
+                                       It takes the shared GameState and an EffectJournal, and
+                                       makes its changes through the journal.
+            revert_on_deactivate (bool): Whether the effect is undone when the power-up expires.
+                                         Instant effects (extra time, clearing the board) keep
+                                         their result and are only reverted by an explicit undo.
         """
         self.name = name
         self.description = description
         self.duration = duration
         self.effect_function = effect_function
+        self.revert_on_deactivate = revert_on_deactivate
         self.is_active = False
         self.start_time = None
+        self.journal = EffectJournal()
 
-    def activate(self, game_state):
+    def activate(self, game_state, now=None):
         """
         Activates the power-up, applying its effect and setting the active flag.
 
         Args:
-            game_state: The current state of the game (e.g., a dictionary containing game data).
+            game_state (GameState): The shared game state.
+            now (float): The activation time; defaults to time.time().
         """
         if not self.is_active:
             self.is_active = True
-            self.start_time = time.time()
-            self.effect_function(game_state)  # Apply the power-up's effect
+            self.start_time = time.time() if now is None else now
+            self.journal = EffectJournal()
+            self.effect_function(game_state, self.journal)  # Apply the power-up's effect
             print(f"{self.name} activated! {self.description}")  # Provide feedback to the user
         else:
             print(f"{self.name} is already active.")
 
     def deactivate(self, game_state):
         """
-        Deactivates the power-up, reverting its effect.  Override in subclass if needed.
+        Deactivates the power-up, reverting its effect if revert_on_deactivate is set.
 
         Args:
-            game_state: The current state of the game.
+            game_state (GameState): The shared game state.
         """
+        if self.revert_on_deactivate:
+            self.journal.revert(game_state)
         self.is_active = False
         self.start_time = None
         print(f"{self.name} deactivated.")
 
-    def update(self, game_state):
+    def update(self, game_state, now=None):
         """
         Updates the power-up state, checking if it has expired.
 
         Args:
-            game_state: The current state of the game.
+            game_state (GameState): The shared game state.
+            now (float): The current time; defaults to time.time().
 
         Returns:
             bool: True if the power-up has expired and needs deactivation, False otherwise.
         """
         if self.is_active:
-            elapsed_time = time.time() - self.start_time
+            elapsed_time = (time.time() if now is None else now) - self.start_time
             if elapsed_time >= self.duration:
                 self.deactivate(game_state)
                 return True  # Signal that the power-up has expired
         return False
 
+    def undo(self, game_state):
+        """
+        Reverts everything this power-up's effect changed and deactivates it.
+
+        Args:
+            game_state (GameState): The shared game state.
+        """
+        self.journal.revert(game_state)
+        self.is_active = False
+        self.start_time = None
+        print(f"{self.name} undone.")
+
     def __str__(self):
         return f"{self.name}: {self.description} (Duration: {self.duration} seconds)"
 
 
-def grant_extra_time(game_state):
+def grant_extra_time(game_state, journal):
     """
     A power-up effect function that grants extra time.
 
     Args:
-        game_state (dict): The game state dictionary.  Must contain a 'time_remaining' key.
+        game_state (GameState): The shared game state.  Its time_remaining must not be None.
+        journal (EffectJournal): Records the change so it can be reverted.
     """
-    if 'time_remaining' in game_state:
+    if game_state.time_remaining is not None:
         extra_time = 10  # Seconds to add
-        game_state['time_remaining'] += extra_time
-        print(f"Added {extra_time} seconds! Time remaining: {game_state['time_remaining']}")
+        journal.add(game_state, "time_remaining", extra_time)
+        print(f"Added {extra_time} seconds! Time remaining: {game_state.time_remaining}")
     else:
-        print("Error: Time remaining not found in game state.")
+        print("Error: This game has no timer.")
 
 
-def double_score(game_state):
+def double_score(game_state, journal):
     """
     A power-up effect function that doubles the player's score.
 
     Args:
-        game_state (dict): The game state dictionary.  Must contain a 'score_multiplier' key.
+        game_state (GameState): The shared game state.
+        journal (EffectJournal): Records the change so it can be reverted.
     """
-    if 'score_multiplier' in game_state:
-        game_state['score_multiplier'] *= 2
-        print(f"Score multiplier doubled! Current multiplier: {game_state['score_multiplier']}")
-    else:
-        print("Error: Score multiplier not found in game state.")
+    journal.scale(game_state, "score_multiplier", 2)
+    print(f"Score multiplier doubled! Current multiplier: {game_state.score_multiplier}")
 
 
-def clear_board(game_state):
+def clear_board(game_state, journal):
     """
-    A power-up effect function that clears the board. Assumes a 'board' key in game_state.
+    A power-up effect function that clears the board.
 
     Args:
-        game_state (dict): The game state dictionary.
+        game_state (GameState): The shared game state.  Its board must provide clear() and restore().
+        journal (EffectJournal): Records the cleared cells so they can be refilled.
     """
-    if 'board' in game_state:
-        rows = len(game_state['board'])
-        cols = len(game_state['board'][0]) if rows > 0 else 0 # handle empty boards
-        game_state['board'] = [[' ' for _ in range(cols)] for _ in range(rows)]  # Clear the board
+    if game_state.board is not None:
+        journal.clear_board(game_state)
         print("Board cleared!")
     else:
         print("Error: Game board not found in game state.")
@@ -122,16 +194,24 @@ class PowerUpManager:
     Manages the power-ups in the game, including creation, activation, and tracking.
     """
 
-    def __init__(self):
+    def __init__(self, max_history=32, telemetry=None):
         """
         Initializes the PowerUpManager with a list of available power-ups.
+
+        Args:
+            max_history (int): Number of past activations that can be undone.
+            telemetry (telemetry.EventLog): Optional log of activations, expiries and undos.
         """
         self.available_power_ups = [
-            PowerUp("Bloom Boost", "Grants extra time", 10, grant_extra_time),
+            PowerUp("Bloom Boost", "Grants extra time", 10, grant_extra_time, revert_on_deactivate=False),
             PowerUp("Score Surge", "Doubles your score", 5, double_score),
-            PowerUp("Board Blast", "Clears the entire board", 0.1, clear_board),
+            PowerUp("Board Blast", "Clears the entire board", 0.1, clear_board, revert_on_deactivate=False),
         ]
         self.active_power_ups = []
+        self.history = []  # Activated power-ups whose effects can still be undone, oldest first
+        self.max_history = max_history
+        self.pending_power_ups = []  # Queued activations, applied together on the next tick
+        self.telemetry = telemetry
 
     def create_power_up(self, power_up_name):
         """
@@ -145,7 +225,8 @@ class PowerUpManager:
         """
         for power_up in self.available_power_ups:
             if power_up.name.lower() == power_up_name.lower():
-                return PowerUp(power_up.name, power_up.description, power_up.duration, power_up.effect_function)
+                return PowerUp(power_up.name, power_up.description, power_up.duration, power_up.effect_function,
+                               power_up.revert_on_deactivate)
         print(f"Error: Invalid power-up name: {power_up_name}")
         return None
 
@@ -155,42 +236,124 @@ class PowerUpManager:
 
         Args:
             power_up_name (str): The name of the power-up to activate.
-            game_state: The current state of the game.
+            game_state (GameState): The shared game state.
 
         Returns:
             bool: True if the power-up was activated successfully, False otherwise.
         """
+        started = time.perf_counter()
         power_up = self.create_power_up(power_up_name)
         if power_up:
             power_up.activate(game_state)
             self.active_power_ups.append(power_up)
+            self._remember(power_up)
+            self._record_event('activate', power_up.name, started)
+            return True
+        self._record_event('activate', None, started, 'error')
+        return False
+
+    def queue_power_up(self, power_up_name):
+        """
+        Queues a power-up to be activated on the next call to update_power_ups.
+
+        Args:
+            power_up_name (str): The name of the power-up to activate.
+
+        Returns:
+            bool: True if the power-up name is valid, False otherwise.
+        """
+        power_up = self.create_power_up(power_up_name)
+        if power_up:
+            self.pending_power_ups.append(power_up)
             return True
         return False
 
     def update_power_ups(self, game_state):
         """
-        Updates the state of all active power-ups, deactivating any that have expired.
+        Runs one tick: applies every queued activation as a batch, then deactivates
+        any power-ups that have expired.  All effects on a tick share one timestamp.
 
         Args:
-            game_state: The current state of the game.
+            game_state (GameState): The shared game state.
         """
-        expired_power_ups = []
+        now = time.time()
+        game_state.tick += 1
+
+        if self.pending_power_ups:
+            pending, self.pending_power_ups = self.pending_power_ups, []
+            for power_up in pending:
+                started = time.perf_counter()
+                power_up.activate(game_state, now)
+                self._remember(power_up)
+                self._record_event('activate', power_up.name, started)
+            self.active_power_ups.extend(pending)
+
+        still_active = []
         for power_up in self.active_power_ups:
-            if power_up.update(game_state):
-                expired_power_ups.append(power_up)
+            started = time.perf_counter()
+            if not power_up.update(game_state, now):
+                still_active.append(power_up)
+            else:
+                self._record_event('expire', power_up.name, started)
+        if len(still_active) != len(self.active_power_ups):
+            self.history = [power_up for power_up in self.history if power_up.journal]  # Drop reverted effects
+        self.active_power_ups = still_active
+
+    def undo_power_up(self, power_up, game_state):
+        """
+        Reverts exactly what one power-up changed, even if other effects have been applied since.
 
-        for power_up in expired_power_ups:
+        Args:
+            power_up (PowerUp): A power-up activated by this manager.
+            game_state (GameState): The shared game state.
+        """
+        started = time.perf_counter()
+        power_up.undo(game_state)
+        if power_up in self.active_power_ups:
             self.active_power_ups.remove(power_up)
+        if power_up in self.history:
+            self.history.remove(power_up)
+        self._record_event('undo', power_up.name, started)
+
+    def undo_last(self, game_state):
+        """
+        Reverts the most recently activated power-up that still has an effect to undo.
+
+        Args:
+            game_state (GameState): The shared game state.
+
+        Returns:
+            PowerUp: The power-up that was undone, or None if there was nothing to undo.
+        """
+        while self.history:
+            power_up = self.history[-1]
+            if power_up.journal:
+                self.undo_power_up(power_up, game_state)
+                return power_up
+            self.history.pop()
+        return None
+
+    def _record_event(self, action, name, started, outcome='ok'):
+        """Sends a power-up action to the telemetry log, if one is attached.  The power-up's name is the flower field."""
+        if self.telemetry is not None:
+            self.telemetry.record(action, flower=name, duration=time.perf_counter() - started, outcome=outcome)
+
+    def _remember(self, power_up):
+        """Adds an activated power-up to the undo history, forgetting the oldest beyond max_history."""
+        self.history.append(power_up)
+        if len(self.history) > self.max_history:
+            del self.history[0]
 
 
 # Example Usage
 if __name__ == '__main__':
+    from game import GameBoard, Flower
+
     # Initialize game state
-    game_state = {
-        'time_remaining': 30,
-        'score_multiplier': 1,
-        'board': [['R', 'G', 'B'], ['Y', 'R', 'G'], ['B', 'Y', 'R']]
-    }
+    board = GameBoard(3, 3)
+    board.place_flower(Flower("Rose", "red", "small"), 0, 0)
+    board.place_flower(Flower("Tulip", "yellow", "medium"), 1, 1)
+    game_state = GameState(board=board, time_remaining=30)
 
     # Initialize power-up manager
     power_up_manager = PowerUpManager()
@@ -203,8 +366,8 @@ if __name__ == '__main__':
     print("\nSimulating game running...")
     for _ in range(12):
         time.sleep(1)
-        game_state['time_remaining'] -= 1
-        print(f"Time Remaining: {game_state['time_remaining']}")
+        game_state.time_remaining -= 1
+        print(f"Time Remaining: {game_state.time_remaining}")
         power_up_manager.update_power_ups(game_state)
 
         #Check score multiplier during the 'Score Surge' power up
@@ -214,7 +377,6 @@ if __name__ == '__main__':
         if _ == 7:
             print("\nActivating Board Blast...")
             power_up_manager.activate_power_up("Board Blast", game_state)
-            print(f"Game Board: {game_state['board']}")
+            game_state.board.display_board()
 
     print("\nGame over!")
-```
\ No newline at end of file
@@ -0,0 +1,422 @@
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import secrets
+import sys
+import time
+from collections import OrderedDict
+
+from game import BloomBurstGame, Order, parse_commands
+from levels.level_4 import Level4
+from power_ups import PowerUpManager
+from zobrist import EvaluationCache
+
+LEVEL4_FLOWERS = {
+    'S': "Sunflower",
+    'L': "Lavender",
+    'C': "Crimson Rose",
+    'W': "White Lily",
+}
+
+HELP = ("commands: new classic [zen]|level4 (replaces this connection's session) | resume <token> | state | pu <power-up name> | stats | quit; "
+        "classic: p <flower> <row> <col>; r <row> <col>; c | "
+        "level4: p <S|L|C|W> <row> <col>; s <row> <col>; c; hint")
+
+
+class Session:
+    """
+    One player's game hosted by the server.
+
+    While live, a session holds its game object; once evicted for being idle it
+    holds only a compact JSON snapshot and is restored on its next command.
+    Only the holder of its random resume token can reattach to it, and only
+    while no other connection owns it.
+    """
+
+    __slots__ = ("session_id", "token", "owner", "resumed", "kind", "game", "power_ups", "snapshot", "last_active")
+
+    def __init__(self, session_id, kind, game):
+        self.session_id = session_id
+        self.token = secrets.token_hex(16)
+        self.owner = None  # The connection currently driving this session
+        self.resumed = False  # Set once the token has been used; such sessions outlive a 'new'
+        self.kind = kind
+        self.game = game
+        self.power_ups = None  # Created on first power-up use
+        self.snapshot = None
+        self.last_active = time.monotonic()
+
+    @property
+    def state(self):
+        return self.game.state
+
+    def is_idle_evictable(self):
+        """Sessions with running power-ups stay live so their effects expire on time."""
+        return self.game is not None and not (
+            self.power_ups and (self.power_ups.active_power_ups or self.power_ups.pending_power_ups)
+        )
+
+
+def snapshot_classic(game):
+    """Encodes a BloomBurstGame as compact JSON bytes."""
+    names = {flower.name: str(index) for index, flower in game.available_flowers.items()}
+    grid = "".join(names[flower.name] if flower else "0" for row in game.board.grid for flower in row)
+    return json.dumps([
+        game.rows, game.cols, grid, game.score, game.state.score_multiplier,
+        game.zen_mode, game.game_over, game.current_order.requirements,
+    ], separators=(",", ":")).encode()
+
+
+def restore_classic(data, evaluation_cache):
+    """Rebuilds a BloomBurstGame from snapshot_classic output."""
+    rows, cols, grid, score, multiplier, zen_mode, game_over, requirements = json.loads(data)
+    game = BloomBurstGame(rows, cols)
+    game.evaluation_cache = evaluation_cache
+    for index, symbol in enumerate(grid):
+        if symbol != "0":
+            game.board.place_flower(game.available_flowers[int(symbol)], *divmod(index, cols))
+    game.score = score
+    game.state.score_multiplier = multiplier
+    game.zen_mode = zen_mode
+    game.game_over = game_over
+    game.current_order = Order(requirements)
+    return game
+
+
+def snapshot_level4(level):
+    """Encodes a Level4 as compact JSON bytes."""
+    return json.dumps([
+        "".join("".join(row) for row in level.grid), level.creeper_coverage, level.pruning_shears_used,
+        level.available_flowers["White Lily"]["count"], level.state.score, level.state.score_multiplier,
+        level.game_over, level.message,
+    ], separators=(",", ":")).encode()
+
+
+def restore_level4(data, evaluation_cache):
+    """Rebuilds a Level4 from snapshot_level4 output."""
+    grid, coverage, shears_used, lilies, score, multiplier, game_over, message = json.loads(data)
+    level = Level4(evaluation_cache=evaluation_cache)
+    cols = level.grid_size[1]
+    for index, symbol in enumerate(grid):
+        level.grid[index // cols][index % cols] = symbol  # In place: the threat map shares this grid
+    level.zobrist_hash = level.zobrist.hash_grid(level.grid, empty='.')
+    level.threat_map.rebuild()
+    level.creeper_coverage = coverage
+    level.pruning_shears_used = shears_used
+    level.available_flowers["White Lily"]["count"] = lilies
+    level.state.score = score
+    level.state.score_multiplier = multiplier
+    level.game_over = game_over
+    level.message = message
+    return level
+
+
+class GameServer:
+    """
+    Hosts many isolated Bloom Burst sessions in one asyncio process.
+
+    Clients speak a line protocol: each request line gets exactly one reply
+    line starting with "ok" or "err".  A single ticker task advances creepers
+    and power-ups for every live session in one batch per tick, evicts idle
+    sessions to snapshots, and drops snapshots nobody has resumed within
+    session_ttl.  Starting a new game on a connection drops its previous
+    session unless that session was ever resumed.
+    """
+
+    def __init__(self, tick_interval=1.0, idle_timeout=60.0, session_ttl=3600.0):
+        """
+        Args:
+            tick_interval (float): Seconds between creeper/power-up ticks.
+            idle_timeout (float): Seconds of inactivity before a session is evicted to a snapshot.
+            session_ttl (float): Seconds of inactivity before an unowned session is dropped for good.
+        """
+        self.tick_interval = tick_interval
+        self.idle_timeout = idle_timeout
+        self.session_ttl = session_ttl
+        self.sessions = {}
+        self.sessions_by_token = {}
+        self.live = {}                 # session_id -> session holding a game object
+        self.snapshots = OrderedDict()  # session_id -> evicted session, oldest eviction first
+        self._ids = itertools.count(1)
+        self.evaluation_caches = {"classic": EvaluationCache(65536), "level4": EvaluationCache(65536)}
+        self.started = time.monotonic()
+        self.cpu_started = time.process_time()
+        self.actions = 0
+        self.evictions = 0
+        self.restores = 0
+        self.expired = 0
+        self._discard = open(os.devnull, "w")  # Power-up effects print feedback meant for the CLI
+
+    # --- Session management -------------------------------------------------
+
+    def new_session(self, kind, zen_mode=False):
+        """Creates a live session of the given kind ("classic" or "level4")."""
+        if kind == "classic":
+            game = BloomBurstGame()
+            game.evaluation_cache = self.evaluation_caches["classic"]
+            game.zen_mode = zen_mode
+            game.generate_order()
+        elif kind == "level4":
+            game = Level4(evaluation_cache=self.evaluation_caches["level4"])
+        else:
+            raise ValueError(f"Unknown game kind: {kind}")
+        session = Session(next(self._ids), kind, game)
+        self.sessions[session.session_id] = session
+        self.sessions_by_token[session.token] = session
+        self.live[session.session_id] = session
+        return session
+
+    def drop(self, session):
+        """Forgets a session entirely; its token can no longer be resumed."""
+        self.sessions.pop(session.session_id, None)
+        self.sessions_by_token.pop(session.token, None)
+        self.live.pop(session.session_id, None)
+        self.snapshots.pop(session.session_id, None)
+
+    def touch(self, session):
+        """Marks a session active, restoring it from its snapshot if it was evicted."""
+        session.last_active = time.monotonic()
+        if session.game is None:
+            restore = restore_classic if session.kind == "classic" else restore_level4
+            session.game = restore(session.snapshot, self.evaluation_caches[session.kind])
+            session.snapshot = None
+            del self.snapshots[session.session_id]
+            self.live[session.session_id] = session
+            self.restores += 1
+
+    def evict(self, session):
+        """Replaces a session's game object with a compact snapshot."""
+        snapshot = snapshot_classic if session.kind == "classic" else snapshot_level4
+        session.snapshot = snapshot(session.game)
+        session.game = None
+        session.power_ups = None
+        del self.live[session.session_id]
+        self.snapshots[session.session_id] = session
+        self.evictions += 1
+
+    def expire(self, now):
+        """Drops snapshots idle for longer than session_ttl.  Sessions held by a connection are kept."""
+        while self.snapshots:
+            session = next(iter(self.snapshots.values()))
+            if now - session.last_active <= self.session_ttl:
+                break
+            if session.owner is not None:
+                session.last_active = now  # An open connection counts as activity
+                self.snapshots.move_to_end(session.session_id)
+                continue
+            self.drop(session)
+            self.expired += 1
+
+    def live_sessions(self):
+        return len(self.live)
+
+    # --- Ticking --------------------------------------------------------------
+
+    def tick(self):
+        """Advances every live session by one tick and evicts idle sessions, in a single pass."""
+        now = time.monotonic()
+        idle = []
+        with contextlib.redirect_stdout(self._discard):
+            for session in self.live.values():
+                if session.power_ups is not None:
+                    session.power_ups.update_power_ups(session.state)
+                if session.kind == "level4":
+                    session.game.update_level_state()
+                if now - session.last_active > self.idle_timeout and session.is_idle_evictable():
+                    idle.append(session)
+        for session in idle:
+            self.evict(session)
+        self.expire(now)
+
+    async def run_ticker(self):
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            self.tick()
+
+    # --- Protocol -------------------------------------------------------------
+
+    def release(self, session, owner):
+        """Detaches a session from a connection so it can be resumed elsewhere."""
+        if session is not None and session.owner is owner:
+            session.owner = None
+
+    def handle_line(self, session, line, owner=None):
+        """
+        Applies one request line and returns (session, reply).
+
+        Args:
+            session (Session): The connection's current session, or None.
+            line (str): The request line.
+            owner: Identifies the connection sending the line; a session can be
+                   resumed only while no other owner holds it.
+        """
+        parts = line.split()
+        if not parts:
+            return session, "err empty request"
+        verb = parts[0].lower()
+        self.actions += 1
+        if session is not None and session.session_id not in self.sessions:
+            session = None  # Expired
+
+        if verb == "new":
+            kind = parts[1].lower() if len(parts) > 1 else "classic"
+            if kind not in ("classic", "level4"):
+                return session, f"err unknown game kind '{kind}'"
+            if session is not None and session.owner is owner and not session.resumed:
+                self.drop(session)  # Abandoned: nobody else has ever resumed it
+            else:
+                self.release(session, owner)
+            session = self.new_session(kind, zen_mode=parts[2:] == ["zen"])
+            session.owner = owner
+            return session, f"ok session {session.session_id} token {session.token}"
+        if verb == "resume":
+            resumed = self.sessions_by_token.get(parts[1]) if len(parts) == 2 else None
+            if resumed is None:
+                return session, "err no such session"
+            if resumed.owner is not None and resumed.owner is not owner:
+                return session, "err session is in use by another connection"
+            self.release(session, owner)
+            resumed.owner = owner
+            resumed.resumed = True
+            self.touch(resumed)
+            return resumed, f"ok session {resumed.session_id}"
+        if verb == "stats":
+            return session, "ok " + json.dumps(self.stats(), separators=(",", ":"))
+        if verb == "help":
+            return session, "ok " + HELP
+        if session is None:
+            return session, "err no session (send 'new classic' or 'new level4')"
+
+        self.touch(session)
+        if verb == "state":
+            return session, "ok " + self.describe(session)
+        if session.game.game_over:
+            # Like the CLI script mode, nothing but 'state' runs once a game has ended.
+            return session, "err game over (send 'new classic' or 'new level4')"
+        if verb == "pu":
+            if session.power_ups is None:
+                session.power_ups = PowerUpManager()
+            with contextlib.redirect_stdout(self._discard):
+                queued = session.power_ups.queue_power_up(" ".join(parts[1:]))
+            return session, "ok queued" if queued else "err unknown power-up"
+        if session.kind == "classic":
+            return session, self.handle_classic(session.game, line)
+        return session, self.handle_level4(session.game, parts)
+
+    def handle_classic(self, game, line):
+        """Runs classic commands through the same parser and rules as the CLI script mode."""
+        results = []
+        try:
+            for _, command, args in parse_commands([line]):
+                result = game.execute_command(command, args)
+                if result is not None:
+                    results.append(result)
+        except ValueError as e:
+            return f"err {e}"
+        return "ok " + " | ".join(results) if results else "ok"
+
+    def handle_level4(self, level, parts):
+        verb = parts[0].lower()
+        try:
+            if verb == "p" and len(parts) == 4:
+                flower = LEVEL4_FLOWERS.get(parts[1].upper(), parts[1])
+                success = level.place_flower(int(parts[2]), int(parts[3]), flower)
+            elif verb == "s" and len(parts) == 3:
+                success = level.use_pruning_shears(int(parts[1]), int(parts[2]))
+            elif verb == "c" and len(parts) == 1:
+                success = level.check_order_fulfilled()
+            elif verb == "hint" and len(parts) == 1:
+                best = level.threat_map.best_pruning_locations(1)
+                return f"ok prune {best[0][0]} {best[0][1]}" if best else "ok no creepers to prune"
+            else:
+                return "err unknown command (send 'help')"
+        except ValueError:
+            return "err arguments must be integers"
+        return ("ok " if success else "err ") + level.message
+
+    def describe(self, session):
+        """Returns a one-line summary of a session's game."""
+        game = session.game
+        if session.kind == "classic":
+            return (f"score={game.score} multiplier={game.state.score_multiplier} "
+                    f"order={json.dumps(game.current_order.requirements, separators=(',', ':'))} "
+                    f"game_over={game.game_over}")
+        grid = "/".join("".join(row) for row in game.grid)
+        return (f"grid={grid} creepers={game.creeper_coverage} "
+                f"shears={game.pruning_shears_available - game.pruning_shears_used} game_over={game.game_over}")
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "live_sessions": self.live_sessions(),
+            "expired_sessions": self.expired,
+            "actions": self.actions,
+            "evictions": self.evictions,
+            "restores": self.restores,
+            "uptime": round(time.monotonic() - self.started, 3),
+            "cpu_seconds": round(time.process_time() - self.cpu_started, 3),
+        }
+
+    async def handle_connection(self, reader, writer):
+        session = None
+        owner = object()  # Unique per connection
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode("utf-8", "replace").strip()
+                if text.lower() == "quit":
+                    break
+                session, reply = self.handle_line(session, text, owner)
+                writer.write(reply.encode() + b"\n")
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.release(session, owner)
+            writer.close()
+
+
+async def serve(host="127.0.0.1", port=7777, unix_path=None, tick_interval=1.0, idle_timeout=60.0,
+                session_ttl=3600.0):
+    """Starts the game server and runs until cancelled."""
+    game_server = GameServer(tick_interval, idle_timeout, session_ttl)
+    if unix_path:
+        server = await asyncio.start_unix_server(game_server.handle_connection, path=unix_path, limit=1 << 16)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(game_server.handle_connection, host, port, backlog=4096, limit=1 << 16)
+        where = f"{host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Bloom Burst server listening on {where}", flush=True)
+    ticker = asyncio.create_task(game_server.run_ticker())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        ticker.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many Bloom Burst sessions in one process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--tick", type=float, default=1.0, help="seconds between creeper/power-up ticks")
+    parser.add_argument("--idle-timeout", type=float, default=60.0, help="seconds before idle sessions are evicted")
+    parser.add_argument("--session-ttl", type=float, default=3600.0,
+                        help="seconds before abandoned sessions are dropped for good")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.tick, args.idle_timeout, args.session_ttl))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import json
+import struct
+import threading
+import time
+
+# Binary format: a stream of records, each starting with a one-byte type.
+#   RECORD_STRING: <B type><I id><H length><utf-8 bytes>   defines an interned string
+#   RECORD_EVENT:  <B type><d timestamp><I action><i row><i col><I flower><f duration><I outcome>
+# String id 0 means "no value".  Rows and columns outside the int32 range are clamped,
+# and strings are truncated to 65535 bytes.
+RECORD_STRING = 0
+RECORD_EVENT = 1
+_STRING_HEADER = struct.Struct("<BIH")
+_EVENT = struct.Struct("<BdIiiIfI")
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+_MAX_STRING_BYTES = 0xFFFF
+
+FORMATS = ("jsonl", "binary")
+
+
+class EventLog:
+    """
+    Non-blocking telemetry log for gameplay events.
+
+    Events are written into a preallocated ring buffer by the game thread and
+    flushed to disk in batches by a background thread, so recording never waits
+    on file I/O.  When the buffer is full new events are dropped and counted.
+    """
+
+    def __init__(self, path, capacity=8192, flush_interval=0.5, file_format="jsonl"):
+        """
+        Args:
+            path (str): File the events are appended to.
+            capacity (int): Number of events the ring buffer can hold.
+            flush_interval (float): Seconds between background flushes.
+            file_format (str): "jsonl" for JSON lines or "binary" for the compact format above.
+        """
+        if file_format not in FORMATS:
+            raise ValueError(f"Invalid telemetry format: {file_format} (expected one of {', '.join(FORMATS)})")
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.file_format = file_format
+
+        self._buffer = [None] * capacity
+        self._head = 0    # Next slot to flush
+        self._size = 0    # Number of buffered events
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._strings = {None: 0}  # Interned strings for the binary format
+
+        self.recorded = 0
+        self.dropped = 0        # Events lost to a full buffer or that could not be encoded
+        self.encode_errors = 0  # The subset of dropped events that could not be encoded
+        self.flushed = 0
+
+        self._file = open(path, "ab" if file_format == "binary" else "a", encoding=None if file_format == "binary" else "utf-8")
+        self._flusher = threading.Thread(target=self._flush_loop, name="telemetry-flusher", daemon=True)
+        self._flusher.start()
+
+    def record(self, action, row=-1, col=-1, flower=None, duration=0.0, outcome=None):
+        """
+        Records one event.  Never blocks on I/O; returns False if the event was dropped
+        because the buffer is full or the log is closed.
+
+        Args:
+            action (str): What happened (e.g. "place", "check", "creeper_tick").
+            row (int): Row of the affected cell, or -1.
+            col (int): Column of the affected cell, or -1.
+            flower (str): Name of the flower involved, or None.
+            duration (float): How long the action took, in seconds.
+            outcome (str): Result of the action (e.g. "ok", "error", "fulfilled"), or None.
+        """
+        event = (time.time(), action, row, col, flower, duration, outcome)
+        with self._lock:
+            if self._closed or self._size == self.capacity:
+                self.dropped += 1
+                return False
+            self._buffer[(self._head + self._size) % self.capacity] = event
+            self._size += 1
+            self.recorded += 1
+            if self._size * 2 >= self.capacity:
+                self._wakeup.set()  # Flush early rather than waiting for the interval.
+        return True
+
+    def stats(self):
+        """Returns the recorded, flushed, dropped and buffered event counts."""
+        with self._lock:
+            return {"recorded": self.recorded, "flushed": self.flushed, "dropped": self.dropped,
+                    "encode_errors": self.encode_errors, "buffered": self._size}
+
+    def close(self):
+        """Flushes remaining events and stops the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True  # Under the lock, so no event lands after the final flush
+        self._wakeup.set()
+        self._flusher.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _take_batch(self):
+        """Removes and returns every buffered event, oldest first."""
+        with self._lock:
+            head, size = self._head, self._size
+            end = head + size
+            if end <= self.capacity:
+                batch = self._buffer[head:end]
+            else:
+                batch = self._buffer[head:] + self._buffer[:end - self.capacity]
+            self._head = end % self.capacity
+            self._size = 0
+        return batch
+
+    def _flush_loop(self):
+        """Periodically writes buffered events to the file until closed."""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            closing = self._closed
+            batch = self._take_batch()
+            if batch:
+                encode = self._encode_binary if self.file_format == "binary" else self._encode_jsonl
+                data, written = encode(batch)
+                try:
+                    self._file.write(data)
+                    self._file.flush()
+                except (OSError, ValueError):
+                    lost, written = written, 0  # Keep running; the next flush may succeed.
+                else:
+                    lost = 0
+                with self._lock:
+                    self.flushed += written
+                    self.dropped += len(batch) - written
+                    self.encode_errors += len(batch) - written - lost
+            if closing:
+                return
+
+    def _encode_jsonl(self, batch):
+        """Encodes a batch as JSON lines.  Returns (text, number of events encoded)."""
+        lines = []
+        for timestamp, action, row, col, flower, duration, outcome in batch:
+            try:
+                lines.append(json.dumps({
+                    "time": timestamp, "action": action, "row": row, "col": col,
+                    "flower": flower, "duration": duration, "outcome": outcome,
+                }))
+            except (TypeError, ValueError):
+                continue  # Counted as dropped by the caller
+        return ("\n".join(lines) + "\n" if lines else ""), len(lines)
+
+    def _intern(self, value, chunks):
+        """Returns the id of a string, emitting its definition the first time it is seen."""
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            data = str(value).encode("utf-8")[:_MAX_STRING_BYTES]
+            chunks.append(_STRING_HEADER.pack(RECORD_STRING, string_id, len(data)))
+            self._strings[value] = string_id
+            chunks.append(data)
+        return string_id
+
+    def _encode_binary(self, batch):
+        """Encodes a batch in the binary format.  Returns (bytes, number of events encoded)."""
+        chunks = []
+        encoded = 0
+        for timestamp, action, row, col, flower, duration, outcome in batch:
+            try:
+                action_id = self._intern(action, chunks)
+                flower_id = self._intern(flower, chunks)
+                outcome_id = self._intern(outcome, chunks)
+                row = min(max(int(row), _INT32_MIN), _INT32_MAX)
+                col = min(max(int(col), _INT32_MIN), _INT32_MAX)
+                chunks.append(_EVENT.pack(RECORD_EVENT, timestamp, action_id, row, col, flower_id, duration, outcome_id))
+            except (struct.error, TypeError, ValueError, OverflowError):
+                continue  # String definitions already emitted stay valid; the event is dropped.
+            encoded += 1
+        return b"".join(chunks), encoded
+
+
+def read_binary_log(path):
+    """Decodes a binary telemetry file into a list of event dicts (for analysis scripts)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    strings = {0: None}
+    events = []
+    offset = 0
+    while offset < len(data):
+        record_type = data[offset]
+        if record_type == RECORD_STRING:
+            _, string_id, length = _STRING_HEADER.unpack_from(data, offset)
+            offset += _STRING_HEADER.size
+            strings[string_id] = data[offset:offset + length].decode("utf-8")
+            offset += length
+        elif record_type == RECORD_EVENT:
+            _, timestamp, action, row, col, flower, duration, outcome = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            events.append({
+                "time": timestamp, "action": strings[action], "row": row, "col": col,
+                "flower": strings[flower], "duration": duration, "outcome": strings[outcome],
+            })
+        else:
+            raise ValueError(f"Corrupt telemetry file at byte {offset}.")
+    return events
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from asset_manager import AssetCache, AssetManager
+
+
+def raw(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, len(data)
+
+
+@pytest.fixture
+def assets_dir(tmp_path):
+    for i in range(20):
+        level_dir = tmp_path / "images" / "level_4"
+        level_dir.mkdir(parents=True, exist_ok=True)
+        (level_dir / f"sprite_{i}.png").write_bytes(b"i" * 500)
+        (tmp_path / "sounds").mkdir(exist_ok=True)
+        (tmp_path / "sounds" / f"effect_{i}.wav").write_bytes(b"s" * 500)
+    return tmp_path
+
+
+def wait_for_preloads(manager, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while manager.pending_count() or manager._in_flight:
+        assert time.monotonic() < deadline, "preloading did not finish"
+        time.sleep(0.01)
+
+
+def test_shared_preloads_do_not_evict_next_level_assets(assets_dir):
+    decoders = {"image": raw, "sound": raw}
+    manager = AssetManager(str(assets_dir), max_cache_bytes=15_000, workers=2, decoders=decoders)
+    try:
+        manager.preload_level(4)
+        wait_for_preloads(manager)
+        level_assets = [entry.name for entry in manager.assets_for_level(4)]
+        assert len(level_assets) == 20
+        assert all(name in manager.cache for name in level_assets)
+        # Workers decode in parallel, so a shared asset may be cached first and then evicted for a level asset.
+        assert manager.cache.current_bytes <= 15_000
+
+        # Explicit requests still evict least recently used assets normally.
+        for i in range(20):
+            manager.get(f"sounds/effect_{i}.wav")
+        assert manager.cache.current_bytes <= 15_000
+        assert manager.cache.evictions > 0
+    finally:
+        manager.shutdown()
+
+
+def test_background_put_evicts_only_unpinned_entries():
+    cache = AssetCache(max_bytes=300)
+    cache.put("a", "A", 100)
+    cache.put("b", "B", 100)
+    cache.pin(["b", "c", "d"])
+    cache.put("x", "X", 100)
+    assert not cache.put("y", "Y", 100, background=True)  # Unpinned: only free budget
+    assert cache.put("c", "C", 100, background=True)      # Pinned: evicts unpinned "a"
+    assert "a" not in cache and "b" in cache and "x" in cache
+    assert cache.put("d", "D", 100, background=True)      # Evicts unpinned "x"
+    assert not cache.put("e", "E", 100, background=True)
+    assert {"b", "c", "d"} == {name for name in ("a", "b", "c", "d", "x") if name in cache}
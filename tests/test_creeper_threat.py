@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from levels.creeper_threat import CreeperThreatMap
+
+SYMBOLS = ".....CCSL"
+
+
+def random_grid(rng, rows, cols):
+    return [[rng.choice(SYMBOLS) for _ in range(cols)] for _ in range(rows)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_update_matches_rebuild_after_random_edits(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(1, 8), rng.randint(1, 8)
+    grid = random_grid(rng, rows, cols)
+    starts = [(rng.randrange(rows), rng.randrange(cols)) for _ in range(rng.randint(0, 3))]
+    threat_map = CreeperThreatMap(grid, starts)
+
+    for _ in range(50):
+        changed = {(rng.randrange(rows), rng.randrange(cols)) for _ in range(rng.randint(1, 4))}
+        for row, col in changed:
+            grid[row][col] = rng.choice(SYMBOLS)
+        threat_map.update(changed)
+
+        expected = CreeperThreatMap(grid, starts)
+        assert threat_map.distances == expected.distances
+        assert threat_map.total_threat() == expected.total_threat()
+        assert threat_map.best_pruning_locations() == expected.best_pruning_locations()
+
+
+def test_pruning_ranking_matches_rebuilt_threat():
+    rng = random.Random(7)
+    grid = random_grid(rng, 6, 6)
+    threat_map = CreeperThreatMap(grid, [(0, 0)])
+    for row, col, reduction, cleared in threat_map.best_pruning_locations():
+        pruned = [list(cells) for cells in grid]
+        count = 0
+        for r in (row, row + 1):
+            for c in (col, col + 1):
+                if pruned[r][c] == 'C':
+                    pruned[r][c] = '.'
+                    count += 1
+        assert count == cleared
+        assert threat_map.total_threat() - CreeperThreatMap(pruned, [(0, 0)]).total_threat() == reduction
@@ -0,0 +1,53 @@
+import io
+import os
+
+from game import BloomBurstGame, main
+
+
+class RecordingStream(io.StringIO):
+    """Counts writes so tests can see when output is produced."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_results_are_written_as_they_are_produced():
+    game = BloomBurstGame()
+    game.zen_mode = True
+    out = RecordingStream()
+
+    def lines():
+        yield "p 1 0 0"
+        yield "c"
+        assert out.writes > 0, "the first result should be written before the script ends"
+        yield "bogus"
+
+    errors = game.run_script(lines(), out=out)
+    output = out.getvalue().splitlines()
+    assert errors == 1
+    assert output[-2].startswith("line 3: Error:")
+    assert output[-1].startswith("Commands applied: 2, errors: 1")
+
+
+def test_quiet_script_does_not_touch_the_leaderboard(tmp_path, monkeypatch, capsys):
+    script = tmp_path / "session.txt"
+    script.write_text("p 1 0 0; c\n")
+    monkeypatch.chdir(tmp_path)
+    main(["--script", str(script), "--quiet", "--zen"])
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 1 and output[0].startswith("Commands applied:")
+    assert not os.path.exists(tmp_path / "leaderboard.db")
+
+
+def test_submit_as_records_the_score(tmp_path, monkeypatch, capsys):
+    script = tmp_path / "session.txt"
+    script.write_text("p 1 0 0\n")
+    monkeypatch.chdir(tmp_path)
+    main(["--script", str(script), "--submit-as", "replay-bot"])
+    assert "Leaderboard rank for level 1: #1" in capsys.readouterr().out
+    assert os.path.exists(tmp_path / "leaderboard.db")
@@ -0,0 +1,74 @@
+import random
+import time
+
+import pytest
+
+from leaderboard import Leaderboard, ScoreHistogram
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_histogram_counts_match_brute_force(seed):
+    rng = random.Random(seed)
+    histogram = ScoreHistogram(max_buckets=rng.choice([8, 64, 1 << 20]), initial_buckets=4)
+    spread = rng.choice([10, 10_000, 10 ** 12])
+    scores = []
+    for _ in range(500):
+        score = rng.randint(-spread, spread)
+        histogram.add(score)
+        scores.append(score)
+    for query in scores[:50] + [rng.randint(-2 * spread, 2 * spread) for _ in range(50)]:
+        assert histogram.count_above(query) == sum(score > query for score in scores)
+
+
+def test_rank_and_top_scores_match_brute_force(tmp_path):
+    rng = random.Random(3)
+    submitted = {1: [], 2: []}
+    with Leaderboard(str(tmp_path / "scores.db"), top_k=20) as leaderboard:
+        for i in range(2000):
+            level = rng.choice((1, 2))
+            player, score = f"p{rng.randrange(50)}", rng.randrange(0, 5000, 100)
+            leaderboard.submit_score(level, player, score)
+            submitted[level].append((player, score))
+        leaderboard.flush()
+
+        for level, entries in submitted.items():
+            top = leaderboard.top_scores(level, 10)
+            assert [score for _, score in top] == sorted((score for _, score in entries), reverse=True)[:10]
+            for _, score in entries[:100]:
+                assert leaderboard.rank_of_score(level, score) == 1 + sum(other > score for _, other in entries)
+            player = entries[0][0]
+            best = max(score for name, score in entries if name == player)
+            assert leaderboard.best_score(level, player) == best
+            assert leaderboard.player_rank(level, player) == leaderboard.rank_of_score(level, best)
+
+    # The caches are rebuilt from disk on reopen.
+    with Leaderboard(str(tmp_path / "scores.db"), top_k=20) as reopened:
+        for level, entries in submitted.items():
+            assert [score for _, score in reopened.top_scores(level, 10)] == \
+                sorted((score for _, score in entries), reverse=True)[:10]
+            for _, score in entries[:100]:
+                assert reopened.rank_of_score(level, score) == 1 + sum(other > score for _, other in entries)
+
+
+def test_cache_updates_and_rank_queries_stay_fast_with_a_million_scores(tmp_path):
+    rng = random.Random(0)
+    leaderboard = Leaderboard(str(tmp_path / "scores.db"))
+    try:
+        count = 1_000_000
+        started = time.perf_counter()
+        with leaderboard._lock:  # Exercise the in-memory cache path without the database writes
+            for _ in range(count):
+                leaderboard._cache_score(1, "bot", rng.randrange(10_000_000))
+        per_submit = (time.perf_counter() - started) / count
+
+        queries = [rng.randrange(10_000_000) for _ in range(10_000)]
+        started = time.perf_counter()
+        for score in queries:
+            leaderboard.rank_of_score(1, score)
+            leaderboard.top_scores(1, 10)
+        per_read = (time.perf_counter() - started) / len(queries)
+    finally:
+        leaderboard.close()
+
+    assert per_submit < 1e-4
+    assert per_read < 1e-3
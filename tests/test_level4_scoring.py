@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pytest
+
+from levels.level_4 import Level4, score_grids
+
+SYMBOLS = ".#SSLLCW"
+
+
+def random_grid(rng, rows, cols, symmetric):
+    grid = [[rng.choice(SYMBOLS) for _ in range(cols)] for _ in range(rows)]
+    if symmetric:  # Mirror most cells so some grids pass the symmetry threshold
+        for row in range(rows):
+            for col in range(cols):
+                if rng.random() < 0.9:
+                    grid[rows - 1 - row][cols - 1 - col] = grid[row][col]
+    return grid
+
+
+def single_grid_scores(level, grid):
+    """Scores one grid with Level4's own per-cell loops."""
+    for row, cells in enumerate(grid):
+        level.grid[row][:] = cells
+    golden = level.calculate_golden_ratio_score()
+    symmetry = level.calculate_symmetry_score()
+    sunflowers = sum(row.count('S') + row.count('#') for row in grid)
+    lavender = sum(row.count('L') for row in grid)
+    roses = sum(row.count('C') for row in grid)
+    fulfilled = (
+        sunflowers >= level.sunflower_count_required
+        and lavender >= level.lavender_count_required
+        and roses >= level.crimson_rose_count_required
+        and roses <= level.max_creeper_coverage
+        and golden >= 50
+        and symmetry >= 75
+    )
+    return sunflowers, lavender, roses, golden, symmetry, fulfilled
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_score_grids_matches_single_grid_checks(seed):
+    rng = random.Random(seed)
+    level = Level4()
+    rows, cols = level.grid_size
+    grids = [random_grid(rng, rows, cols, symmetric=i % 2 == 0) for i in range(300)]
+
+    scores = level.score_candidates(grids)
+    for index, grid in enumerate(grids):
+        sunflowers, lavender, roses, golden, symmetry, fulfilled = single_grid_scores(level, grid)
+        assert scores["sunflower_count"][index] == sunflowers
+        assert scores["lavender_count"][index] == lavender
+        assert scores["crimson_rose_count"][index] == roses
+        assert scores["creeper_coverage"][index] == roses
+        assert scores["golden_ratio_score"][index] == golden
+        assert scores["symmetry_score"][index] == symmetry
+        assert bool(scores["fulfilled"][index]) == fulfilled
+    assert 0 < np.count_nonzero(scores["fulfilled"]) < len(grids)  # Both outcomes are exercised
+
+
+@pytest.mark.parametrize("shape", [(2, 3), (4, 4), (5, 8)])
+def test_score_grids_handles_other_shapes(shape):
+    rng = random.Random(sum(shape))
+    level = Level4()
+    rows, cols = shape
+    level.grid_size = shape
+    level.grid = [['.'] * cols for _ in range(rows)]
+    for _ in range(50):
+        grid = random_grid(rng, rows, cols, symmetric=True)
+        scores = score_grids(np.array(grid))
+        _, _, _, golden, symmetry, _ = single_grid_scores(level, grid)
+        assert scores["golden_ratio_score"][0] == golden
+        assert scores["symmetry_score"][0] == symmetry
+
+
+def test_check_order_fulfilled_agrees_with_score_candidates():
+    rng = random.Random(42)
+    level = Level4()
+    rows, cols = level.grid_size
+    for _ in range(200):
+        grid = random_grid(rng, rows, cols, symmetric=True)
+        for row, cells in enumerate(grid):
+            level.grid[row][:] = cells
+        level.zobrist_hash = level.zobrist.hash_grid(level.grid, empty='.')  # Evaluations are cached by hash
+        level.creeper_coverage = sum(row.count('C') for row in grid)
+        level.game_over = False
+        expected = bool(level.score_candidates([grid])["fulfilled"][0])
+        assert level.check_order_fulfilled() == expected
@@ -0,0 +1,69 @@
+import itertools
+import random
+
+from game import BloomBurstGame, Order
+from order_queue import AttributeVocabulary, OrderQueue
+
+
+def all_orders(game):
+    """Every order over the game's attributes, plus ones asking for values no flower has."""
+    choices = {attribute: sorted(values) + ["ultraviolet"] for attribute, values in game.attributes.items()}
+    orders = [Order({})]
+    for attribute, values in choices.items():
+        orders.extend(Order({attribute: value}) for value in values)
+    for color, size in itertools.product(choices["color"], choices["size"]):
+        orders.append(Order({"color": color, "size": size}))
+    return orders
+
+
+def test_match_agrees_with_check_fulfillment():
+    rng = random.Random(5)
+    game = BloomBurstGame()
+    flowers = list(game.available_flowers.values())
+    orders = all_orders(game)
+    queue = OrderQueue()
+    ids = {queue.add(order, priority=rng.randrange(3)): order for order in orders * 2}
+
+    for _ in range(300):
+        arrangement = [rng.choice(flowers) for _ in range(rng.randrange(0, 6))]
+        matched = {entry.order_id for entry in queue.match(arrangement)}
+        expected = {order_id for order_id, order in ids.items() if order.check_fulfillment(arrangement)}
+        assert matched == expected
+
+
+def test_orders_are_served_by_priority_then_deadline():
+    queue = OrderQueue()
+    order = Order({})
+    late = queue.add(order, priority=1, deadline=20)
+    no_deadline = queue.add(order, priority=1)
+    urgent = queue.add(order, priority=1, deadline=10)
+    low = queue.add(order, priority=0, deadline=1)
+    high = queue.add(order, priority=5)
+
+    assert [entry.order_id for entry in queue.pending()] == [high, urgent, late, no_deadline, low]
+    assert [entry.order_id for entry in queue.match([])] == [high, urgent, late, no_deadline, low]
+    assert [entry.order_id for entry in queue.pop_fulfilled([], limit=2)] == [high, urgent]
+    assert len(queue) == 3 and high not in queue
+
+
+def test_expire_skips_orders_already_removed():
+    queue = OrderQueue()
+    order = Order({"color": "red"})
+    first = queue.add(order, deadline=5)
+    second = queue.add(order, deadline=6)
+    kept = queue.add(order, deadline=50)
+    assert queue.remove(first).order_id == first
+    assert queue.remove(first) is None
+
+    assert [entry.order_id for entry in queue.expire(now=10)] == [second]
+    assert queue.expire(now=10) == []
+    assert [entry.order_id for entry in queue.pending()] == [kept]
+
+
+def test_shared_vocabulary_is_kept_even_when_empty():
+    vocabulary = AttributeVocabulary()
+    first, second = OrderQueue(vocabulary), OrderQueue(vocabulary)
+    assert first.vocabulary is vocabulary and second.vocabulary is vocabulary
+    first.add(Order({"color": "red"}))
+    second.add(Order({"size": "large"}))
+    assert len(vocabulary) == 2
@@ -0,0 +1,58 @@
+from game import Flower, GameBoard
+from game_state import GameState
+from power_ups import EffectJournal, PowerUpManager
+
+
+def test_overlapping_score_surges_revert_independently():
+    state = GameState(score_multiplier=1)
+    manager = PowerUpManager()
+    manager.activate_power_up("Score Surge", state)
+    first = manager.active_power_ups[-1]
+    manager.activate_power_up("Score Surge", state)
+    second = manager.active_power_ups[-1]
+    assert state.score_multiplier == 4
+
+    # The first surge expires while the second is still running.
+    assert first.update(state, now=first.start_time + first.duration)
+    assert state.score_multiplier == 2
+    assert not second.update(state, now=second.start_time)
+
+    assert second.update(state, now=second.start_time + second.duration)
+    assert state.score_multiplier == 1
+
+
+def test_undo_out_of_order_keeps_other_effects():
+    state = GameState(score_multiplier=3, time_remaining=30)
+    manager = PowerUpManager()
+    manager.activate_power_up("Score Surge", state)
+    surge = manager.active_power_ups[-1]
+    manager.activate_power_up("Bloom Boost", state)
+    manager.activate_power_up("Score Surge", state)
+    assert (state.score_multiplier, state.time_remaining) == (12, 40)
+
+    manager.undo_power_up(surge, state)
+    assert (state.score_multiplier, state.time_remaining) == (6, 40)
+    assert isinstance(state.score_multiplier, int)
+
+    while manager.undo_last(state) is not None:
+        pass
+    assert (state.score_multiplier, state.time_remaining) == (3, 30)
+
+
+def test_clear_board_restores_only_cleared_cells():
+    board = GameBoard(3, 3)
+    rose, tulip = Flower("Rose", "red", "small"), Flower("Tulip", "yellow", "medium")
+    board.place_flower(rose, 0, 0)
+    original_hash = board.zobrist_hash
+    state = GameState(board=board)
+    journal = EffectJournal()
+    journal.clear_board(state)
+    assert board.grid[0][0] is None
+
+    board.place_flower(tulip, 1, 1)
+    journal.revert(state)
+    assert board.grid[0][0] is rose
+    assert board.grid[1][1] is tulip
+    assert len(journal) == 0
+    board.remove_flower(1, 1)
+    assert board.zobrist_hash == original_hash
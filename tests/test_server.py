@@ -0,0 +1,63 @@
+import time
+
+from server import GameServer
+
+
+def test_repeated_new_on_one_connection_keeps_one_session():
+    server = GameServer()
+    owner = object()
+    session = None
+    for _ in range(100):
+        session, reply = server.handle_line(session, "new classic", owner)
+        assert reply.startswith("ok session")
+    assert len(server.sessions) == len(server.sessions_by_token) == server.live_sessions() == 1
+
+
+def test_resumed_sessions_survive_new_and_are_owned_by_one_connection():
+    server = GameServer()
+    first, second = object(), object()
+    session, reply = server.handle_line(None, "new level4", first)
+    token = reply.split()[-1]
+
+    assert server.handle_line(None, f"resume {session.session_id}", second)[1] == "err no such session"
+    assert server.handle_line(None, f"resume {token}", second)[1] == "err session is in use by another connection"
+
+    server.release(session, first)  # The first connection disconnects
+    resumed, reply = server.handle_line(None, f"resume {token}", second)
+    assert resumed is session and reply == f"ok session {session.session_id}"
+
+    server.handle_line(resumed, "new classic", second)
+    assert session.session_id in server.sessions  # Was resumed, so 'new' keeps it
+
+
+def test_abandoned_snapshots_expire_after_ttl():
+    server = GameServer(idle_timeout=0.0, session_ttl=10.0)
+    owner = object()
+    kept, _ = server.handle_line(None, "new classic", owner)
+    abandoned, _ = server.handle_line(None, "new classic", object())
+    server.release(abandoned, abandoned.owner)
+
+    for session in (kept, abandoned):
+        session.last_active = time.monotonic() - 1.0
+    server.tick()
+    assert len(server.snapshots) == 2 and server.live_sessions() == 0
+
+    server.expire(time.monotonic() + 60.0)
+    assert abandoned.session_id not in server.sessions
+    assert abandoned.token not in server.sessions_by_token
+    assert kept.session_id in server.sessions  # Still held by an open connection
+    assert server.stats()["expired_sessions"] == 1
+
+    # The owning connection can keep playing; its snapshot is restored.
+    session, reply = server.handle_line(kept, "state", owner)
+    assert reply.startswith("ok score=") and server.live_sessions() == 1 and not server.snapshots
+
+
+def test_moves_are_rejected_after_game_over():
+    server = GameServer()
+    for kind, move in (("classic", "c"), ("level4", "p S 0 0")):
+        session, _ = server.handle_line(None, f"new {kind}")
+        session.game.game_over = True
+        assert server.handle_line(session, move)[1].startswith("err game over")
+        assert server.handle_line(session, "pu score surge")[1].startswith("err game over")
+        assert server.handle_line(session, "state")[1].startswith("ok ")
@@ -0,0 +1,39 @@
+import json
+
+from telemetry import EventLog, read_binary_log
+
+
+def test_record_after_close_is_dropped(tmp_path):
+    log = EventLog(str(tmp_path / "events.jsonl"), flush_interval=0.01)
+    assert log.record("place", 0, 0, "Rose", 0.001, "ok")
+    log.close()
+    assert not log.record("place", 1, 1, "Rose", 0.001, "ok")
+    stats = log.stats()
+    assert (stats["recorded"], stats["flushed"], stats["dropped"], stats["buffered"]) == (1, 1, 1, 0)
+    assert len((tmp_path / "events.jsonl").read_text().splitlines()) == 1
+
+
+def test_binary_log_round_trips_and_survives_bad_events(tmp_path):
+    path = tmp_path / "events.bin"
+    with EventLog(str(path), capacity=100_000, flush_interval=0.01, file_format="binary") as log:
+        log.record("place", 40000, -(1 << 40), "Rose", 0.5, "ok")   # Clamped, not fatal
+        log.record("place", "not a row")                             # Cannot be encoded
+        for i in range(70000):                                       # More than 65535 distinct strings
+            log.record("tick", outcome=f"coverage={i}")
+        log.record("check", outcome="fulfilled")
+    events = read_binary_log(str(path))
+    stats = log.stats()
+    assert stats["encode_errors"] == 1
+    assert stats["dropped"] == 1 and stats["flushed"] == len(events) == stats["recorded"] - 1
+    assert events[0]["row"] == 40000 and events[0]["col"] == -(1 << 31) and events[0]["flower"] == "Rose"
+    assert events[-1]["action"] == "check" and events[-1]["outcome"] == "fulfilled"
+
+
+def test_jsonl_log_skips_unencodable_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with EventLog(str(path), flush_interval=0.01) as log:
+        log.record("place", outcome=object())
+        log.record("remove", 2, 3, None, 0.0, "ok")
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["action"] for line in lines] == ["remove"]
+    assert log.stats()["dropped"] == 1
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from vec_env import VERB_CHECK, VERB_PLACE, VecBloomBurstEnv
+
+
+def test_step_before_reset_raises():
+    env = VecBloomBurstEnv(2, seed=0)
+    with pytest.raises(RuntimeError):
+        env.step(np.zeros((2, 4), dtype=np.int64))
+
+
+def test_reset_encodes_every_order():
+    env = VecBloomBurstEnv(8, seed=3)
+    observation = env.reset()
+    for index, game in enumerate(env.games):
+        expected = env._planes(env.vocabulary.compile(game.current_order))
+        assert (observation["order"][index] == expected).all()
+    assert not observation["board"].any()
+
+
+def test_seeded_envs_replay_identically():
+    first, second = VecBloomBurstEnv(4, seed=11), VecBloomBurstEnv(4, seed=11)
+    assert (first.reset()["order"] == second.reset()["order"]).all()
+    actions = np.array([[1, 0, 0, VERB_PLACE]] * 4)
+    checks = np.array([[0, 0, 0, VERB_CHECK]] * 4)
+    for batch in (actions, checks):
+        (obs_a, rewards_a, dones_a, _), (obs_b, rewards_b, dones_b, _) = first.step(batch), second.step(batch)
+        assert (obs_a["order"] == obs_b["order"]).all() and (obs_a["board"] == obs_b["board"]).all()
+        assert (rewards_a == rewards_b).all() and (dones_a == dones_b).all()
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from game import BloomBurstGame
+from levels.level_4 import Level4
+from zobrist import EvaluationCache, ZobristTable
+
+
+def board_hash(board):
+    names = [[flower.name if flower else None for flower in row] for row in board.grid]
+    return board.zobrist.hash_grid(names)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_game_board_hash_matches_full_rehash(seed):
+    rng = random.Random(seed)
+    game = BloomBurstGame(4, 5, rng=rng)
+    board = game.board
+    cleared = []
+    for _ in range(400):
+        roll = rng.random()
+        row, col = rng.randrange(board.rows), rng.randrange(board.cols)
+        if roll < 0.5 and board.grid[row][col] is None:
+            board.place_flower(game.available_flowers[rng.randint(1, 5)], row, col)
+        elif roll < 0.85 and board.grid[row][col] is not None:
+            board.remove_flower(row, col)
+        elif roll < 0.93:
+            cleared = board.clear()
+        else:
+            board.restore(cleared)
+        assert board.zobrist_hash == board_hash(board)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_level4_hash_matches_full_rehash(seed, monkeypatch):
+    rng = random.Random(seed)
+    monkeypatch.setattr("levels.level_4.random", random.Random(seed))  # Creeper growth
+    level = Level4()
+    rows, cols = level.grid_size
+    cleared = []
+    for _ in range(400):
+        level.game_over = False  # Keep growing and placing past the coverage limit
+        roll = rng.random()
+        if roll < 0.45:
+            level.place_flower(rng.randrange(rows), rng.randrange(cols),
+                               rng.choice(["Sunflower", "Lavender", "Crimson Rose", "White Lily"]))
+        elif roll < 0.6:
+            level.pruning_shears_used = 0
+            level.use_pruning_shears(rng.randrange(rows - 1), rng.randrange(cols - 1))
+        elif roll < 0.85:
+            level.grow_creepers()
+        elif roll < 0.93:
+            cleared = level.clear()
+        else:
+            level.restore(cleared)
+        assert level.zobrist_hash == level.zobrist.hash_grid(level.grid, empty='.')
+
+
+def test_keys_depend_only_on_seed_and_cell():
+    cells = [(r, c, piece) for r in range(3) for c in range(3) for piece in ("Rose", "C")]
+    forward, backward = ZobristTable(seed=7), ZobristTable(seed=7)
+    expected = {cell: forward.key(*cell) for cell in cells}
+    assert {cell: backward.key(*cell) for cell in reversed(cells)} == expected
+    assert len(set(expected.values())) == len(cells)
+    assert ZobristTable(seed=8).key(0, 0, "Rose") != expected[(0, 0, "Rose")]
+
+
+def test_evaluation_cache_counts_hits_and_evicts_least_recently_used():
+    cache = EvaluationCache(maxsize=2)
+    calls = []
+
+    def compute(value):
+        def inner():
+            calls.append(value)
+            return value * 10
+        return inner
+
+    assert cache.get_or_compute("a", compute(1)) == 10
+    assert cache.get_or_compute("b", compute(2)) == 20
+    assert cache.get_or_compute("a", compute(99)) == 10  # Hit: "a" becomes most recently used
+    assert cache.get_or_compute("c", compute(3)) == 30   # Evicts "b"
+    assert cache.get_or_compute("b", compute(2)) == 20   # Miss again
+    assert calls == [1, 2, 3, 2]
+    assert cache.stats() == {"hits": 1, "misses": 4, "size": 2, "maxsize": 2}
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 1 and cache.misses == 4
+
+
+def test_order_checks_reuse_cached_evaluations():
+    game = BloomBurstGame(3, 3, rng=random.Random(1))
+    game.evaluation_cache = EvaluationCache()
+    game.generate_order()
+    game.place_flower(1, 0, 0)
+    first = game.is_order_fulfilled()
+    assert game.is_order_fulfilled() == first
+    assert (game.evaluation_cache.misses, game.evaluation_cache.hits) == (1, 1)
+
+    game.remove_flower(0, 0)
+    game.place_flower(1, 0, 0)  # Same board again, so the same hash
+    assert game.is_order_fulfilled() == first
+    assert (game.evaluation_cache.misses, game.evaluation_cache.hits) == (1, 2)
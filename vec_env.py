@@ -0,0 +1,158 @@
+import random
+
+import numpy as np
+
+from game import BloomBurstGame
+from order_queue import AttributeVocabulary
+
+VERB_NOOP = 0
+VERB_PLACE = 1
+VERB_REMOVE = 2
+VERB_CHECK = 3
+
+
+class VecBloomBurstEnv:
+    """
+    Gym-style environment stepping N independent BloomBurstGame instances in lockstep.
+
+    Actions are an (N, 4) integer array of (flower, row, col, verb) rows, where
+    verb is one of VERB_NOOP, VERB_PLACE, VERB_REMOVE or VERB_CHECK (flower is
+    only used by VERB_PLACE; row and col are ignored by VERB_CHECK).  All rules
+    run through the BloomBurstGame and GameBoard methods, so rewards match
+    check_order_action.  Games are created by reset(), which must be called
+    before the first step(); finished games are reset automatically.
+
+    Observations are a dict of numpy arrays:
+        "board": (N, planes, rows, cols) uint8, one plane per flower attribute value.
+        "order": (N, planes) uint8, the attribute values the current order requires.
+    """
+
+    def __init__(self, num_envs, rows=5, cols=5, zen_mode=False, max_steps=None, seed=None):
+        """
+        Args:
+            num_envs (int): Number of games stepped together.
+            rows (int): Board rows.
+            cols (int): Board columns.
+            zen_mode (bool): If True, failed orders don't end an episode.
+            max_steps (int): Episodes are truncated after this many steps, or None for no limit.
+            seed (int): Seed for order generation; each game gets its own derived stream.
+        """
+        self.num_envs = num_envs
+        self.rows = rows
+        self.cols = cols
+        self.zen_mode = zen_mode
+        self.max_steps = max_steps
+        seeder = random.Random(seed)
+        self._rngs = [random.Random(seeder.getrandbits(64)) for _ in range(num_envs)]
+
+        self.games = None  # Created by reset()
+        self.vocabulary = AttributeVocabulary()
+        template = BloomBurstGame(rows, cols)  # Only read for its attributes; draws no random numbers
+        for attribute, values in sorted(template.attributes.items()):
+            for value in sorted(values):
+                self.vocabulary.bit_for(attribute, value)
+        self.num_planes = len(self.vocabulary)
+        self._plane_bits = np.array([1 << i for i in range(self.num_planes)], dtype=np.int64)
+
+        self.board_obs = np.zeros((num_envs, self.num_planes, rows, cols), dtype=np.uint8)
+        self.order_obs = np.zeros((num_envs, self.num_planes), dtype=np.uint8)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.episode_returns = np.zeros(num_envs, dtype=np.float32)
+
+    def _new_game(self, index):
+        """Creates a fresh game with its first order."""
+        game = BloomBurstGame(self.rows, self.cols, rng=self._rngs[index])
+        game.zen_mode = self.zen_mode
+        game.generate_order()
+        return game
+
+    def _planes(self, mask):
+        """Expands an attribute bitmask into a 0/1 vector over the observation planes."""
+        return (mask & self._plane_bits) != 0
+
+    def _encode_order(self, index):
+        """Writes game index's current order into the order observation."""
+        mask = self.vocabulary.compile(self.games[index].current_order)
+        self.order_obs[index] = self._planes(mask)
+
+    def _observation(self):
+        return {"board": self.board_obs.copy(), "order": self.order_obs.copy()}
+
+    def _reset_index(self, index):
+        """Replaces game index with a new game and resets its observation."""
+        self.games[index] = self._new_game(index)
+        self.board_obs[index] = 0
+        self._encode_order(index)
+        self.episode_steps[index] = 0
+        self.episode_returns[index] = 0
+
+    def reset(self):
+        """Starts a new game in every slot and returns the initial observations."""
+        if self.games is None:
+            self.games = [None] * self.num_envs
+        for index in range(self.num_envs):
+            self._reset_index(index)
+        return self._observation()
+
+    def step(self, actions):
+        """
+        Applies one action to every game.
+
+        Args:
+            actions: Integer array-like of shape (N, 4) with (flower, row, col, verb) rows.
+
+        Returns:
+            tuple: (observations, rewards, dones, infos) where rewards is a float32
+                   array of points earned, dones a bool array and infos a list of
+                   dicts.  A done game's info holds its "final_score" and
+                   "terminal_observation"; the returned observation is already
+                   that of the new game.
+
+        Raises:
+            RuntimeError: If reset() has not been called yet.
+            ValueError: If actions has the wrong shape.
+        """
+        if self.games is None:
+            raise RuntimeError("Call reset() before step().")
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs, 4):
+            raise ValueError(f"Expected actions of shape ({self.num_envs}, 4), got {actions.shape}.")
+
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = [{} for _ in range(self.num_envs)]
+
+        for index, (flower_index, row, col, verb) in enumerate(actions.tolist()):
+            game = self.games[index]
+            info = infos[index]
+            try:
+                if verb == VERB_PLACE:
+                    flower = game.place_flower(flower_index, row, col)
+                    self.board_obs[index, :, row, col] = self._planes(self.vocabulary.flower_mask(flower))
+                elif verb == VERB_REMOVE:
+                    game.remove_flower(row, col)
+                    self.board_obs[index, :, row, col] = 0
+                elif verb == VERB_CHECK:
+                    rewards[index] = game.resolve_order()
+                    if not game.game_over:
+                        self._encode_order(index)
+                elif verb != VERB_NOOP:
+                    raise ValueError(f"Invalid verb: {verb}")
+            except ValueError as e:
+                info["invalid_action"] = str(e)
+
+            self.episode_steps[index] += 1
+            self.episode_returns[index] += rewards[index]
+            truncated = self.max_steps is not None and self.episode_steps[index] >= self.max_steps
+            if game.game_over or truncated:
+                dones[index] = True
+                info["final_score"] = game.score
+                info["episode_length"] = int(self.episode_steps[index])
+                info["truncated"] = truncated and not game.game_over
+                info["terminal_observation"] = {
+                    "board": self.board_obs[index].copy(),
+                    "order": self.order_obs[index].copy(),
+                }
+                self._reset_index(index)
+
+        return self._observation(), rewards, dones, infos
@@ -0,0 +1,99 @@
+import hashlib
+from collections import OrderedDict
+
+
+class ZobristTable:
+    """
+    Random 64-bit keys for (row, col, piece) triples.
+
+    A board's hash is the XOR of the keys of every occupied cell, so placing or
+    removing a piece updates the hash with a single XOR.  Each key is a keyed
+    BLAKE2b digest of (row, col, piece), so it depends only on the seed and the
+    cell, never on the order in which keys were first requested; tables built
+    with the same seed always agree.
+    """
+
+    def __init__(self, seed=0x5EED_B100):
+        """
+        Args:
+            seed (int): Seed for the key derivation (a non-negative integer below 2**512).
+        """
+        self._seed = seed.to_bytes(64, "big").lstrip(b"\0") or b"\0"
+        self._keys = {}  # Memoized digests
+
+    def key(self, row, col, piece):
+        """
+        Returns the key for a piece on a cell.
+
+        Args:
+            row (int): Row index.
+            col (int): Column index.
+            piece: Any hashable piece identifier (a flower name or grid symbol).
+        """
+        cell = (row, col, piece)
+        key = self._keys.get(cell)
+        if key is None:
+            digest = hashlib.blake2b(repr(cell).encode("utf-8"), digest_size=8, key=self._seed).digest()
+            key = self._keys[cell] = int.from_bytes(digest, "big")
+        return key
+
+    def hash_grid(self, grid, empty=None):
+        """Computes the hash of a whole grid from scratch, skipping cells equal to empty."""
+        value = 0
+        for row, cells in enumerate(grid):
+            for col, piece in enumerate(cells):
+                if piece != empty:
+                    value ^= self.key(row, col, piece)
+        return value
+
+
+# Shared by every board so hashes (and cached evaluations) are comparable across games.
+DEFAULT_TABLE = ZobristTable()
+
+
+class EvaluationCache:
+    """
+    Bounded LRU cache of board evaluations keyed by Zobrist hash.
+    """
+
+    def __init__(self, maxsize=4096):
+        """
+        Args:
+            maxsize (int): Maximum number of cached evaluations.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached evaluation for key, calling compute() and caching its result on a miss.
+
+        Args:
+            key: A Zobrist hash, or a tuple combining one with other inputs.
+            compute (callable): Produces the evaluation when it is not cached.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def clear(self):
+        """Drops every cached evaluation (the counters are kept)."""
+        self._entries.clear()
+
+    def stats(self):
+        """Returns the cache's hit/miss counters and size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._entries)